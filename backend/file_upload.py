@@ -4,31 +4,72 @@ File upload handling module
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
 from datetime import datetime
 import uuid
+from dataclasses import dataclass
 
-from config import UPLOAD_DIR, MAX_FILE_SIZE, ALLOWED_EXTENSIONS
-from utils.file_utils import get_file_hash, get_file_type, is_allowed_file
+from config import ensure_upload_dir, MAX_FILE_SIZE
+from utils.file_utils import new_file_hasher, format_file_hash, get_file_type
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+
+def _iter_upload_chunks(uploaded_file):
+    """Yield the upload in UPLOAD_CHUNK_SIZE pieces, as zero-copy views when possible"""
+    if hasattr(uploaded_file, "getbuffer"):
+        # Streamlit's UploadedFile is a BytesIO: slice its buffer instead of read() copies
+        # Each slice is released after use; the BytesIO can't be resized while a view exists
+        with uploaded_file.getbuffer() as buffer:
+            for start in range(0, len(buffer), UPLOAD_CHUNK_SIZE):
+                with buffer[start:start + UPLOAD_CHUNK_SIZE] as chunk:
+                    yield chunk
+    else:
+        uploaded_file.seek(0)
+        while chunk := uploaded_file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+@dataclass
+class UploadMetadata:
+    """Metadata for a saved upload (use dataclasses.asdict() for a plain dict)"""
+    __slots__ = ("file_id", "original_name", "file_path", "file_type",
+                 "file_size", "file_hash", "upload_time", "session_id")
+    
+    file_id: str
+    original_name: str
+    file_path: str
+    file_type: Optional[str]
+    file_size: int
+    file_hash: str
+    upload_time: str
+    session_id: Optional[str]
 
 
 class FileUploadHandler:
     """Handle file uploads and validation"""
     
     def __init__(self):
-        self.upload_dir = UPLOAD_DIR
+        self.upload_dir = ensure_upload_dir()
+        self._upload_dir_str = str(self.upload_dir)
         self.max_size = MAX_FILE_SIZE
+        self._index: Optional[Dict[str, Path]] = None  # file_id -> saved path
+        self._known_sessions: Set[str] = set()  # session dirs already created
     
-    def save_uploaded_file(self, uploaded_file, session_id: Optional[str] = None) -> Dict:
+    def save_uploaded_file(self, uploaded_file, session_id: Optional[str] = None,
+                           file_hash: Optional[str] = None) -> UploadMetadata:
         """
         Save uploaded file and return metadata
         
         Args:
             uploaded_file: Streamlit uploaded file object
             session_id: Optional session ID for grouping files
+            file_hash: Fingerprint of the upload if the caller already computed it
+                       (from get_bytes_hash); skips hashing while saving
             
         Returns:
-            Dict with file metadata
+            UploadMetadata for the saved file
         """
         if uploaded_file is None:
             raise ValueError("No file provided")
@@ -37,57 +78,99 @@ class FileUploadHandler:
         if uploaded_file.size > self.max_size:
             raise ValueError(f"File size exceeds maximum allowed size of {self.max_size / (1024*1024):.1f}MB")
         
-        # Validate file extension
-        if not is_allowed_file(uploaded_file.name, ALLOWED_EXTENSIONS):
+        # Validate file extension (every allowed extension maps to a type, so one lookup does both)
+        file_type = get_file_type(uploaded_file.name)
+        if file_type is None:
             raise ValueError(f"File type not supported: {uploaded_file.name}")
         
         # Generate unique file ID
         file_id = str(uuid.uuid4())
-        file_type = get_file_type(uploaded_file.name)
         
         # Create session directory if provided
+        # (plain string paths here; Path objects are only built where they are returned)
         if session_id:
-            session_dir = self.upload_dir / session_id
-            session_dir.mkdir(exist_ok=True)
-            file_path = session_dir / f"{file_id}_{uploaded_file.name}"
+            session_dir = os.path.join(self._upload_dir_str, session_id)
+            if session_id not in self._known_sessions:
+                os.makedirs(session_dir, exist_ok=True)
+                self._known_sessions.add(session_id)
+            file_path = os.path.join(session_dir, f"{file_id}_{uploaded_file.name}")
         else:
-            file_path = self.upload_dir / f"{file_id}_{uploaded_file.name}"
+            file_path = os.path.join(self._upload_dir_str, f"{file_id}_{uploaded_file.name}")
         
-        # Save file
+        # Save file and hash it in the same pass (no second read from disk)
+        hasher = new_file_hasher() if file_hash is None else None
         with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
-        # Generate file hash
-        file_hash = get_file_hash(str(file_path))
+            for chunk in _iter_upload_chunks(uploaded_file):
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+        if hasher is not None:
+            file_hash = format_file_hash(hasher)
         
         # Return metadata
-        metadata = {
-            "file_id": file_id,
-            "original_name": uploaded_file.name,
-            "file_path": str(file_path),
-            "file_type": file_type,
-            "file_size": uploaded_file.size,
-            "file_hash": file_hash,
-            "upload_time": datetime.now().isoformat(),
-            "session_id": session_id
-        }
+        metadata = UploadMetadata(
+            file_id=file_id,
+            original_name=uploaded_file.name,
+            file_path=file_path,
+            file_type=file_type,
+            file_size=uploaded_file.size,
+            file_hash=file_hash,
+            upload_time=datetime.now().isoformat(),
+            session_id=session_id
+        )
+        
+        if self._index is not None:
+            self._index[file_id] = Path(file_path)
         
         return metadata
     
+    def _build_index(self) -> Dict[str, Path]:
+        """Index saved uploads by file ID with a single pass over the upload directory"""
+        index = {}
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Session directory
+                    with os.scandir(entry.path) as session_entries:
+                        for session_entry in session_entries:
+                            if session_entry.is_file():
+                                index[session_entry.name.split("_", 1)[0]] = Path(session_entry.path)
+                elif entry.is_file():
+                    index[entry.name.split("_", 1)[0]] = Path(entry.path)
+        return index
+    
     def get_file_path(self, file_id: str, session_id: Optional[str] = None) -> Optional[Path]:
         """Get file path by file ID"""
-        if session_id:
-            session_dir = self.upload_dir / session_id
-            for file_path in session_dir.glob(f"{file_id}_*"):
-                return file_path
-        else:
-            for file_path in self.upload_dir.glob(f"{file_id}_*"):
+        if self._index is None:
+            self._index = self._build_index()
+        
+        search_dir = self.upload_dir / session_id if session_id else self.upload_dir
+        file_path = self._index.get(file_id)
+        if file_path is not None:
+            # The index is keyed by file ID only; a hit must be in the requested
+            # session's directory and still on disk
+            if file_path.parent == search_dir and file_path.exists():
                 return file_path
+            del self._index[file_id]
+        
+        # Not indexed yet (e.g. saved by another handler), fall back to a directory scan
+        prefix = f"{file_id}_"
+        try:
+            with os.scandir(search_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.is_file(follow_symlinks=False):
+                        file_path = Path(entry.path)
+                        self._index[file_id] = file_path
+                        return file_path
+        except FileNotFoundError:
+            pass
         return None
     
     def delete_file(self, file_id: str, session_id: Optional[str] = None) -> bool:
         """Delete file by file ID"""
         file_path = self.get_file_path(file_id, session_id)
+        if self._index is not None:
+            self._index.pop(file_id, None)
         if file_path and file_path.exists():
             file_path.unlink()
             return True
@@ -95,8 +178,22 @@ class FileUploadHandler:
     
     def cleanup_session(self, session_id: str):
         """Clean up all files in a session"""
-        session_dir = self.upload_dir / session_id
-        if session_dir.exists():
-            shutil.rmtree(session_dir)
+        session_dir = os.path.join(self._upload_dir_str, session_id)
+        if os.path.isdir(session_dir):
+            # Session directories are flat, so unlink entries directly
+            has_subdirs = False
+            with os.scandir(session_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        has_subdirs = True
+                    else:
+                        os.unlink(entry.path)
+            if has_subdirs:
+                shutil.rmtree(session_dir)
+            else:
+                os.rmdir(session_dir)
+            self._known_sessions.discard(session_id)
+            # Indexed paths may point into the removed directory
+            self._index = None
 
 
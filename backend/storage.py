@@ -1,23 +1,98 @@
 """
 Storage management for processed results
 """
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, TextIO
+import time
 
-from config import OUTPUT_DIR
+import orjson
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+from config import ensure_output_dir
+from utils.file_utils import TMP_SUFFIX, open_atomic, sanitize_filename, write_atomic
+
+# orjson writes UTF-8 directly (same as json.dump(..., ensure_ascii=False))
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+PRETTY_JSON_OPTIONS = JSON_OPTIONS | orjson.OPT_INDENT_2
+SAVE_WORKERS = 8  # max threads used by save_results
+# Full per-file results kept out of the UI session (see save_session_results)
+SESSION_RESULTS_DIR = ".session_results"
+
+
+def _timestamp() -> str:
+    """Local time as YYYYMMDD_HHMMSS (time.strftime skips building a datetime)"""
+    return time.strftime("%Y%m%d_%H%M%S")
+
+
+def _iter_markdown_lines(data: Dict, level: int = 0) -> Iterator[str]:
+    """Yield the markdown lines for a dictionary"""
+    # Explicit stack instead of recursion; entries are (dict, level) for nested
+    # dicts, or a finished line string
+    stack = [(data, level)]
+    
+    while stack:
+        entry = stack.pop()
+        if isinstance(entry, str):
+            yield entry
+            continue
+        
+        current, level = entry
+        if not current:
+            yield ""
+            continue
+        
+        indent = "  " * level
+        pending = []
+        for key, value in current.items():
+            if isinstance(value, dict):
+                pending.append(f"{indent}## {key}")
+                pending.append((value, level + 1))
+            elif isinstance(value, list):
+                pending.append(f"{indent}### {key}")
+                for item in value:
+                    if isinstance(item, dict):
+                        pending.append((item, level + 1))
+                    else:
+                        pending.append(f"{indent}- {item}")
+            else:
+                pending.append(f"{indent}**{key}**: {value}")
+        stack.extend(reversed(pending))
+
+
+def _render_markdown(data: Dict, level: int = 0) -> str:
+    """Render a dictionary as markdown"""
+    return "\n".join(_iter_markdown_lines(data, level))
+
+
+def _write_markdown(f: TextIO, data: Dict) -> None:
+    """Stream markdown for a dictionary into an open text file"""
+    lines = _iter_markdown_lines(data)
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+    f.write(first_line)
+    for line in lines:
+        f.write("\n")
+        f.write(line)
 
 
 class StorageManager:
     """Manage storage of processed results"""
     
     def __init__(self):
-        self.output_dir = OUTPUT_DIR
+        self.output_dir = ensure_output_dir()
     
     def save_result(self, result_data: Dict, file_id: str, 
                    processor_name: str, format: str = 'json', 
-                   original_filename: Optional[str] = None) -> Path:
+                   original_filename: Optional[str] = None,
+                   pretty: bool = False) -> Path:
         """
         Save processing result
         
@@ -25,79 +100,157 @@ class StorageManager:
             result_data: Processed data dictionary
             file_id: Original file ID
             processor_name: Name of the processor used
-            format: Output format ('json' or 'md')
+            format: Output format ('json', 'md' or 'msgpack')
             original_filename: Original filename for better naming
+            pretty: Indent JSON output (compact by default)
             
         Returns:
             Path to saved file
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 파일명 생성: 원본파일명_파서명 형식
-        if original_filename:
-            # 확장자 제거
-            base_name = Path(original_filename).stem
-            # 특수문자 제거 및 정리
-            safe_name = "".join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip()
-            safe_name = safe_name.replace(' ', '_')
-            filename = f"{safe_name}_{processor_name}.{format}"
-        else:
-            filename = f"{file_id}_{processor_name}_{timestamp}.{format}"
-        
-        file_path = self.output_dir / filename
+        file_path = self._result_path(file_id, processor_name, format, original_filename)
         
         if format == 'json':
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
+            options = PRETTY_JSON_OPTIONS if pretty else JSON_OPTIONS
+            write_atomic(file_path, orjson.dumps(result_data, option=options))
         elif format == 'md':
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(self._dict_to_markdown(result_data))
+            with open_atomic(file_path, 'w') as f:
+                _write_markdown(f, result_data)
+        elif format == 'msgpack':
+            if not MSGSPEC_AVAILABLE:
+                raise ValueError("msgspec library not available. Install with: pip install msgspec")
+            write_atomic(file_path, msgspec.msgpack.encode(result_data))
         else:
             raise ValueError(f"Unsupported format: {format}")
         
         return file_path
     
+    def save_results(self, results: List[Dict], file_id: str, format: str = 'json',
+                     original_filename: Optional[str] = None,
+                     pretty: bool = False) -> List[Path]:
+        """
+        Save all results for one document in a single call
+        
+        Args:
+            results: Processed data dictionaries (named by "processor" or "parser")
+            file_id: Original file ID
+            format: Output format ('json', 'md' or 'msgpack')
+            original_filename: Original filename for better naming
+            pretty: Indent JSON output (compact by default)
+            
+        Returns:
+            Paths to saved files (results without a processor name are skipped)
+        """
+        named_results = []
+        for result in results:
+            processor_name = result.get("processor") or result.get("parser")
+            if processor_name:
+                named_results.append((processor_name, result))
+        
+        # Writes are independent, so issue them from a small thread pool
+        if len(named_results) <= 1:
+            return [
+                self.save_result(result, file_id, processor_name, format,
+                                 original_filename=original_filename, pretty=pretty)
+                for processor_name, result in named_results
+            ]
+        with ThreadPoolExecutor(max_workers=min(SAVE_WORKERS, len(named_results))) as executor:
+            return list(executor.map(
+                lambda named: self.save_result(named[1], file_id, named[0], format,
+                                               original_filename=original_filename, pretty=pretty),
+                named_results
+            ))
+    
+    def _result_path(self, file_id: str, processor_name: str, format: str,
+                     original_filename: Optional[str] = None) -> Path:
+        """Build the output path for a saved result"""
+        # 파일명 생성: 파일ID_원본파일명_파서명 형식
+        # (file_id 접두사로 get_results_for_file / delete_results_for_file이 찾을 수 있음)
+        if original_filename:
+            # 확장자 제거
+            base_name = Path(original_filename).stem
+            # 특수문자 제거 및 정리
+            safe_name = sanitize_filename(base_name)
+            filename = f"{file_id}_{safe_name}_{processor_name}.{format}"
+        else:
+            filename = f"{file_id}_{processor_name}_{_timestamp()}.{format}"
+        
+        return self.output_dir / filename
+    
     def load_result(self, file_path: Path) -> Dict:
         """Load a saved result"""
         if file_path.suffix == '.json':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
+        elif file_path.suffix == '.msgpack' and MSGSPEC_AVAILABLE:
+            with open(file_path, 'rb') as f:
+                return msgspec.msgpack.decode(f.read())
         else:
             raise ValueError(f"Cannot load format: {file_path.suffix}")
     
+    def save_session_results(self, results: List[Dict], file_id: str) -> Path:
+        """
+        Persist all results for one document so the UI session only keeps the path
+        
+        Args:
+            results: Processed data dictionaries for the document
+            file_id: Original file ID
+            
+        Returns:
+            Path to the saved file (msgpack, or JSON when msgspec is missing or
+            the results hold values msgpack cannot encode); read back with load_result
+        """
+        results_dir = self.output_dir / SESSION_RESULTS_DIR
+        results_dir.mkdir(exist_ok=True)
+        if MSGSPEC_AVAILABLE:
+            try:
+                data = msgspec.msgpack.encode(results)
+            except TypeError:
+                data = None
+            if data is not None:
+                file_path = results_dir / f"{file_id}.msgpack"
+                write_atomic(file_path, data)
+                return file_path
+        file_path = results_dir / f"{file_id}.json"
+        write_atomic(file_path, orjson.dumps(results, option=JSON_OPTIONS))
+        return file_path
+    
     def get_results_for_file(self, file_id: str) -> List[Path]:
         """Get all result files for a given file ID"""
-        return list(self.output_dir.glob(f"{file_id}_*"))
+        prefix = f"{file_id}_"
+        with os.scandir(self.output_dir) as entries:
+            return [
+                Path(entry.path) for entry in entries
+                if entry.name.startswith(prefix) and not entry.name.endswith(TMP_SUFFIX)
+                and entry.is_file(follow_symlinks=False)
+            ]
+    
+    def delete_results_for_file(self, file_id: str) -> int:
+        """Delete all result files for a given file ID; returns how many were removed"""
+        prefix = f"{file_id}_"
+        removed = 0
+        # DirEntry paths go straight to os.unlink (no Path objects per file)
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
     
     def _dict_to_markdown(self, data: Dict, level: int = 0) -> str:
         """Convert dictionary to markdown format"""
-        md_lines = []
-        indent = "  " * level
-        
-        for key, value in data.items():
-            if isinstance(value, dict):
-                md_lines.append(f"{indent}## {key}")
-                md_lines.append(self._dict_to_markdown(value, level + 1))
-            elif isinstance(value, list):
-                md_lines.append(f"{indent}### {key}")
-                for item in value:
-                    if isinstance(item, dict):
-                        md_lines.append(self._dict_to_markdown(item, level + 1))
-                    else:
-                        md_lines.append(f"{indent}- {item}")
-            else:
-                md_lines.append(f"{indent}**{key}**: {value}")
-        
-        return "\n".join(md_lines)
+        return _render_markdown(data, level)
     
-    def save_comparison_result(self, comparison_data: Dict, file_id: str) -> Path:
-        """Save comparison result"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{file_id}_comparison_{timestamp}.json"
+    def save_comparison_result(self, comparison_data: Dict, file_id: str,
+                               pretty: bool = False) -> Path:
+        """Save comparison result (compact JSON unless pretty is set)"""
+        filename = f"{file_id}_comparison_{_timestamp()}.json"
         file_path = self.output_dir / filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(comparison_data, f, ensure_ascii=False, indent=2)
+        options = PRETTY_JSON_OPTIONS if pretty else JSON_OPTIONS
+        write_atomic(file_path, orjson.dumps(comparison_data, option=options))
         
         return file_path
 
@@ -2,6 +2,7 @@
 Configuration settings for the document preprocessing service
 """
 import os
+import functools
 from pathlib import Path
 
 # Base paths
@@ -10,10 +11,21 @@ UPLOAD_DIR = BASE_DIR / "uploads"
 OUTPUT_DIR = BASE_DIR / "outputs"
 CACHE_DIR = BASE_DIR / "cache"
 
-# Create directories if they don't exist
-UPLOAD_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-CACHE_DIR.mkdir(exist_ok=True)
+# Directories are created on first use (not at import), at most once per process
+@functools.cache
+def ensure_upload_dir() -> Path:
+    UPLOAD_DIR.mkdir(exist_ok=True)
+    return UPLOAD_DIR
+
+@functools.cache
+def ensure_output_dir() -> Path:
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    return OUTPUT_DIR
+
+@functools.cache
+def ensure_cache_dir() -> Path:
+    CACHE_DIR.mkdir(exist_ok=True)
+    return CACHE_DIR
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {
@@ -25,6 +37,10 @@ ALLOWED_EXTENSIONS = {
     'image': ['.png', '.jpg', '.jpeg', '.gif', '.bmp']
 }
 
+# Flattened lookups derived from ALLOWED_EXTENSIONS
+ALLOWED_EXT_SET = frozenset(ext for exts in ALLOWED_EXTENSIONS.values() for ext in exts)
+EXT_TO_TYPE = {ext: file_type for file_type, exts in ALLOWED_EXTENSIONS.items() for ext in exts}
+
 # Ollama configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODELS = {
@@ -39,6 +55,6 @@ ENABLE_ENSEMBLE = True
 ENABLE_COMPARISON = True
 
 # Output formats
-OUTPUT_FORMATS = ['json', 'md']
+OUTPUT_FORMATS = ['json', 'md', 'msgpack']
 
 
@@ -7,9 +7,14 @@ import sys
 from pathlib import Path
 import time
 from datetime import datetime
-import json
 import zipfile
-from io import BytesIO
+import orjson
+import pandas as pd
+import tempfile
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -20,16 +25,207 @@ from processing.parsers.pdf_parser import PDFParser
 from processing.parsers.word_parser import WordParser
 from processing.parsers.excel_parser import ExcelParser
 from processing.parsers.ppt_parser import PPTParser
-# Additional parsers will be imported conditionally
 from processing.processors.document_ai import DocumentAIProcessor
 from processing.processors.ensemble_processor import EnsembleProcessor
 from processing.ollama_integration import OllamaProcessor
 from processing.comparison import ResultComparator
-from config import ALLOWED_EXTENSIONS, OUTPUT_FORMATS, OLLAMA_MODELS
-from utils.file_utils import get_file_type
+from processing.parsers.process_pool import parse_in_process
+from config import ALLOWED_EXTENSIONS, CACHE_DIR, OUTPUT_FORMATS, OLLAMA_MODELS
+from utils.file_utils import get_bytes_hashes, get_file_type, sanitize_filename
 
-# Initialize comparator for scoring
-comparator = ResultComparator()
+# Optional PDF parsers, resolved once at startup (None if the module fails to import)
+try:
+    from processing.parsers.pdf_pymupdf_parser import PyMuPDFParser, PYMUPDF_AVAILABLE
+except ImportError:
+    PyMuPDFParser, PYMUPDF_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_pdfminer_parser import PDFMinerParser, PDFMINER_AVAILABLE
+except ImportError:
+    PDFMinerParser, PDFMINER_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_pypdf_parser import PyPDFParser, PYPDF_AVAILABLE
+except ImportError:
+    PyPDFParser, PYPDF_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_camelot_parser import CamelotParser, CAMELOT_AVAILABLE
+except ImportError:
+    CamelotParser, CAMELOT_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_tabula_parser import TabulaParser, TABULA_AVAILABLE
+except ImportError:
+    TabulaParser, TABULA_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_easyocr_parser import EasyOCRParser, EASYOCR_AVAILABLE
+except ImportError:
+    EasyOCRParser, EASYOCR_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_ocr_parser import OCRParser, OCR_AVAILABLE
+except ImportError:
+    OCRParser, OCR_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_unstructured_parser import UnstructuredParser, UNSTRUCTURED_AVAILABLE
+except ImportError:
+    UnstructuredParser, UNSTRUCTURED_AVAILABLE = None, False
+try:
+    from processing.parsers.pdf_pdfquery_parser import PDFQueryParser, PDFQUERY_AVAILABLE
+except ImportError:
+    PDFQueryParser, PDFQUERY_AVAILABLE = None, False
+
+# Optional PDF parsers whose library is installed, probed once at startup
+OPTIONAL_PDF_PARSERS = {
+    name: parser_class
+    for name, parser_class, available in [
+        ("pymupdf_parser", PyMuPDFParser, PYMUPDF_AVAILABLE),
+        ("pdfminer_parser", PDFMinerParser, PDFMINER_AVAILABLE),
+        ("pypdf_parser", PyPDFParser, PYPDF_AVAILABLE),
+        ("camelot_parser", CamelotParser, CAMELOT_AVAILABLE),
+        ("tabula_parser", TabulaParser, TABULA_AVAILABLE),
+        ("easyocr_parser", EasyOCRParser, EASYOCR_AVAILABLE),
+        ("ocr_parser", OCRParser, OCR_AVAILABLE),
+        ("unstructured_parser", UnstructuredParser, UNSTRUCTURED_AVAILABLE),
+        ("pdfquery_parser", PDFQueryParser, PDFQUERY_AVAILABLE),
+    ]
+    if available
+}
+
+# Parse results shared by the processors (re-runs with other settings skip re-parsing)
+PARSE_CACHE_DIR = CACHE_DIR / "parsed"
+
+# Shared handler/processor/parser instances, built once and reused across reruns
+@st.cache_resource
+def get_comparator():
+    return ResultComparator()
+
+
+@st.cache_resource
+def get_upload_handler():
+    return FileUploadHandler()
+
+
+@st.cache_resource
+def get_storage():
+    return StorageManager()
+
+
+@st.cache_resource
+def get_doc_ai():
+    return DocumentAIProcessor(cache_dir=PARSE_CACHE_DIR)
+
+
+@st.cache_resource
+def get_ensemble():
+    return EnsembleProcessor(cache_dir=PARSE_CACHE_DIR)
+
+
+@st.cache_resource
+def get_curator():
+    from processing.processors.curator_processor import CuratorProcessor
+    return CuratorProcessor(
+        enable_cleaning=True,
+        enable_quality_check=True,
+        enable_language_detection=True,
+        cache_dir=PARSE_CACHE_DIR
+    )
+
+
+@st.cache_resource
+def get_parser(file_type):
+    """Base parser for a file type (None if unsupported)"""
+    parsers = {
+        'pdf': PDFParser,
+        'word': WordParser,
+        'excel': ExcelParser,
+        'powerpoint': PPTParser
+    }
+    parser_class = parsers.get(file_type)
+    return parser_class() if parser_class else None
+
+
+@st.cache_resource
+def get_optional_parser(name):
+    """Optional PDF parser instance, or None if it could not be imported/initialized"""
+    parser_class = OPTIONAL_PDF_PARSERS.get(name)
+    if parser_class is None:
+        return None
+    try:
+        return parser_class()
+    except Exception:
+        return None
+
+
+@st.cache_resource
+def get_ollama(model_name):
+    return OllamaProcessor(model_name)
+
+
+@st.cache_resource
+def get_background_executor():
+    """Executor for slow tasks (Ollama) that finish after the file is shown"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+# Comparator for scoring
+comparator = get_comparator()
+
+
+# MIME types for saved result files
+RESULT_MIME_TYPES = {
+    ".json": "application/json",
+    ".md": "text/markdown",
+    ".msgpack": "application/x-msgpack"
+}
+
+# Ollama models offered in the sidebar
+OLLAMA_MODEL_OPTIONS = tuple(OLLAMA_MODELS["multimodal"]) + tuple(OLLAMA_MODELS["text"])
+
+# File list icons by file type
+FILE_ICONS = {
+    "pdf": "📄",
+    "word": "📝",
+    "excel": "📊",
+    "powerpoint": "📑"
+}
+
+# Processor names shown in the results tab
+PROCESSOR_DISPLAY_NAMES = {
+    "pdf_parser": "PDF Parser (pdfplumber)",
+    "pymupdf_parser": "PDF Parser (PyMuPDF)",
+    "pdfminer_parser": "PDF Parser (pdfminer)",
+    "pypdf_parser": "PDF Parser (pypdf)",
+    "easyocr_parser": "PDF Parser (EasyOCR - Better OCR)",
+    "ocr_parser": "PDF Parser (OCR - Tesseract)",
+    "unstructured_parser": "PDF Parser (Unstructured - Advanced)",
+    "pdfquery_parser": "PDF Parser (PDFQuery - CSS Selectors)",
+    "camelot_parser": "PDF Parser (Camelot - Tables)",
+    "tabula_parser": "PDF Parser (Tabula - Tables)",
+    "document_ai": "Document AI Processor",
+    "curator_processor": "Text Curator (NeMo Curator-inspired)",
+    "ensemble_processor": "Ensemble Processor",
+    "base_parser_pdfplumber": "Base Parser (pdfplumber)",
+    "word_parser": "Word Parser",
+    "excel_parser": "Excel Parser",
+    "ppt_parser": "PowerPoint Parser"
+}
+
+# Processor names used in download file names
+PROCESSOR_FILE_NAMES = {
+    "pdf_parser": "pdfplumber",
+    "pymupdf_parser": "pymupdf",
+    "pdfminer_parser": "pdfminer",
+    "pypdf_parser": "pypdf",
+    "easyocr_parser": "easyocr",
+    "ocr_parser": "ocr_tesseract",
+    "unstructured_parser": "unstructured",
+    "pdfquery_parser": "pdfquery",
+    "camelot_parser": "camelot",
+    "tabula_parser": "tabula",
+    "document_ai": "document_ai",
+    "ensemble_processor": "ensemble",
+    "base_parser_pdfplumber": "base_pdfplumber",
+    "word_parser": "word",
+    "excel_parser": "excel",
+    "ppt_parser": "powerpoint"
+}
 
 
 # Page configuration
@@ -47,223 +243,647 @@ if 'processing_results' not in st.session_state:
 if 'session_id' not in st.session_state:
     st.session_state.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 if 'processed_files' not in st.session_state:
-    st.session_state.processed_files = []  # 여러 파일 처리 기록
+    st.session_state.processed_files = {}  # 여러 파일 처리 기록 (file_id -> file_info)
 if 'current_file_id' not in st.session_state:
     st.session_state.current_file_id = None
 
 
+def timed(fn, *args, **kwargs):
+    """Call fn and record its duration (seconds) as "processing_time" on a dict result"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    if isinstance(result, dict):
+        result["processing_time"] = time.perf_counter() - start
+    return result
+
+
+# Task results reused when the same content is processed again with the same options
+TASK_CACHE_TTL = 24 * 60 * 60
+TASK_CACHE_MAX_ENTRIES = 256
+
+
+class TaskResultCache:
+    """Thread-safe LRU of successful task results (tasks run on worker threads without a script context)"""
+    
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_task_cache():
+    return TaskResultCache(TASK_CACHE_TTL, TASK_CACHE_MAX_ENTRIES)
+
+
+def run_cached_task(task_cache, file_hash, file_type, processor_name, options, task):
+    """
+    Run a processing task once per (file content, task, options)
+    
+    Only successful results are cached (None and error results are retried next time).
+    A cache hit is a copy marked "cached": True; its processing_time is the original run's.
+    """
+    key = (file_hash, file_type, processor_name, options)
+    cached = task_cache.get(key)
+    if cached is not None:
+        result = dict(cached)
+        result["cached"] = True
+        return result
+    result = timed(task)
+    if result is not None and "error" not in result:
+        # Callers set top-level keys (file_path, processor) on what they get back, so store a copy
+        task_cache.put(key, dict(result))
+    return result
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def ollama_available(model_name):
+    """Ollama server ping, shared by every file in a batch (rechecked after 30s)"""
+    return get_ollama(model_name).is_available()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_metrics_dataframe(comparison_metrics):
+    """Comparison metrics table, rebuilt only when the metrics change"""
+    return pd.DataFrame(comparison_metrics)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compare_results_cached(results_key, _results):
+    """Compare results once per (processor, text) set instead of on every rerun"""
+    return comparator.compare_results(_results)
+
+
+def comparison_key(results):
+    """Cache key identifying a list of processing results"""
+    return tuple(
+        (r.get("processor") or r.get("parser"), len(r.get("text") or ""), hash(r.get("text") or ""))
+        for r in results
+    )
+
+
+# Parser/processor tasks run per file (mostly I/O, subprocess or native code)
+MAX_TASK_WORKERS = 12
+# Seconds a file waits for its tasks before skipping the unfinished ones
+TASK_TIMEOUT = 300
+# Files processed at once from one upload batch (each fans out its own tasks)
+MAX_FILE_WORKERS = 4
+
+
+def _json_default(obj):
+    # Same fallbacks as st.json: sets become lists, anything else its str()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def fast_json(obj):
+    """Serialize for st.json with orjson (st.json passes str bodies through as-is)"""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+
+
+def result_json_bytes(result):
+    """Indented UTF-8 JSON of one result for downloads (orjson encodes straight to bytes)"""
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def processor_display_name(processor_name):
+    """Human-readable processor name for the results tab"""
+    if processor_name.startswith("ollama_"):
+        return f"Ollama AI ({processor_name[len('ollama_'):]})"
+    return PROCESSOR_DISPLAY_NAMES.get(processor_name, processor_name)
+
+
+def processor_file_name(processor_name):
+    """Processor part of a download file name (Ollama names are kept as-is)"""
+    if processor_name.startswith("ollama_"):
+        return processor_name
+    return PROCESSOR_FILE_NAMES.get(processor_name, processor_name.replace(" ", "_").lower())
+
+
+@functools.lru_cache(maxsize=None)
+def processor_download_label(processor_name):
+    """Processor name shown next to its download buttons"""
+    if processor_name.startswith("ollama_"):
+        return f"Ollama ({processor_name[len('ollama_'):]})"
+    return PROCESSOR_FILE_NAMES.get(processor_name, processor_name)
+
+
+# All-results ZIP: kept in memory up to this size, then spilled to a temp file
+ZIP_SPOOL_MAX_SIZE = 50 * 1024 * 1024  # 50MB
+# Fast deflate level; results are text/JSON and compress well even at level 1
+ZIP_COMPRESS_LEVEL = 1
+# Entries smaller than this are stored uncompressed (deflate saves next to nothing on them)
+ZIP_STORE_MAX_SIZE = 4096
+# Threads serializing results (JSON + markdown) for the ZIP
+ZIP_SERIALIZE_WORKERS = 8
+
+
+# Characters of extracted text shown in the results tab
+TEXT_PREVIEW_CHARS = 5000
+
+
+def text_preview(text):
+    """Text for display; only long texts need truncating (and caching)"""
+    if len(text) <= TEXT_PREVIEW_CHARS:
+        return text
+    return _truncated_text(text)
+
+
+@functools.lru_cache(maxsize=64)
+def _truncated_text(text):
+    """Truncated copy of a long text, computed once per result text"""
+    return text[:TEXT_PREVIEW_CHARS] + "..."
+
+
+def _has_no_error(result):
+    return "error" not in result
+
+
+def _has_tables(result):
+    return "error" not in result and bool(result.get("tables"))
+
+
+def _has_ocr_text(result):
+    return "error" not in result and bool(result.get("text") or result.get("pages"))
+
+
+def _is_valid_result(result):
+    """Result worth showing/saving: no error and some extracted content"""
+    return "error" not in result and bool(result.get("text") or result.get("tables") or result.get("pages") or result.get("metadata"))
+
+
+# Optional PDF parsers as (name, result filter), in display order
+PDF_COMPARISON_PARSERS = [
+    ("pymupdf_parser", _has_no_error),  # PyMuPDF (fast and accurate)
+    ("pdfminer_parser", _has_no_error),  # PDFMiner (good for text extraction)
+    ("pypdf_parser", _has_no_error),  # pypdf (modern PyPDF2 successor)
+]
+PDF_EXTRACTION_PARSERS = [
+    ("camelot_parser", _has_tables),  # Camelot (tables) - requires Java and OpenCV
+    ("tabula_parser", _has_tables),  # Tabula (tables) - requires Java
+    ("easyocr_parser", _has_ocr_text),  # EasyOCR (better OCR alternative)
+    ("ocr_parser", _has_no_error),  # Tesseract OCR (scanned PDFs, fallback)
+    ("unstructured_parser", _has_no_error),  # Unstructured (document structure)
+    ("pdfquery_parser", _has_no_error),  # PDFQuery (CSS-like selectors)
+]
+
+# Mostly pure-Python parsers that hold the GIL; run them in worker processes
+PROCESS_POOL_PARSERS = frozenset({"pdfminer_parser", "camelot_parser"})
+# Parsers that can read the upload from memory (parse(file_path, data=...))
+STREAM_PARSERS = frozenset({"pymupdf_parser", "pypdf_parser", "pdfminer_parser"})
+
+
+def _run_optional_parser(name, file_path, accept=_has_no_error, file_bytes=None):
+    """Run an optional parser; missing libraries or parse failures skip it (returns None)"""
+    parser = get_optional_parser(name)
+    if parser is None:
+        return None
+    try:
+        result = None
+        if name in PROCESS_POOL_PARSERS:
+            # None if the process pool is unavailable; fall back to this thread.
+            # Workers read the file themselves (cheaper than pickling its bytes).
+            result = parse_in_process(type(parser), file_path)
+        if result is None:
+            if file_bytes is not None and name in STREAM_PARSERS:
+                result = parser.parse(file_path, data=file_bytes)
+            else:
+                result = parser.parse(file_path)
+    except Exception:
+        return None
+    return result if accept(result) else None
+
+
+def _optional_parser_tasks(parser_specs, file_path, file_bytes=None):
+    """(name, callable) tasks for the optional parsers that imported successfully"""
+    return [
+        (name, lambda name=name, accept=accept: _run_optional_parser(name, file_path, accept, file_bytes))
+        for name, accept in parser_specs
+        if OPTIONAL_PDF_PARSERS.get(name) is not None
+    ]
+
+
+def _run_curator(file_path, file_type):
+    """Text curation processing (NeMo Curator-inspired)"""
+    try:
+        curator_result = get_curator().process(file_path, file_type)
+    except Exception:
+        return None
+    return curator_result if "error" not in curator_result else None
+
+
+def task_options(processor_name):
+    """Settings that change a task's output (part of its result cache key)"""
+    if processor_name == "curator_processor":
+        curator = get_curator()
+        return (curator.enable_cleaning, curator.enable_quality_check, curator.enable_language_detection)
+    if processor_name == "ensemble_processor":
+        return tuple(get_ensemble().processors)
+    if processor_name.startswith("ollama_"):
+        ollama = get_ollama(processor_name[len("ollama_"):])
+        return (ollama.model, ollama.base_url, ollama.supports_vision)
+    return ()
+
+
+def _run_ollama(file_path, file_type, ollama_model):
+    # Availability is checked once per batch (ollama_available) before files are submitted
+    ollama_result = get_ollama(ollama_model).process_document(file_path, file_type)
+    return ollama_result if ollama_result and "error" not in ollama_result else None
+
+
 def process_single_file(uploaded_file, upload_handler, storage, file_session_id, 
-                       use_ensemble, use_curator, use_ollama, ollama_model, output_format):
-    """단일 파일 처리 함수"""
+                       use_ensemble, use_curator, use_ollama, ollama_model, output_format,
+                       file_hash=None):
+    """단일 파일 처리 함수 (file_hash: 이미 계산된 업로드 해시, 결과 캐시 키로 사용)"""
     # Save uploaded file
-    metadata = upload_handler.save_uploaded_file(uploaded_file, file_session_id)
+    metadata = upload_handler.save_uploaded_file(uploaded_file, file_session_id, file_hash=file_hash)
     
-    # Process file
-    results = []
-    file_path = metadata["file_path"]
-    file_type = metadata["file_type"]
+    file_path = metadata.file_path
+    file_type = metadata.file_type
+    # Upload bytes are already in memory; parsers that accept streams read these
+    # instead of re-reading the saved file
+    file_bytes = uploaded_file.getvalue() if file_type == 'pdf' else None
+    
+    # Processing tasks as (processor name, callable) in display order.
+    # Parsers are shared instances, but parse() opens its own document per call,
+    # so tasks can run in parallel threads.
+    # A task returning None is skipped (optional library missing, error, empty).
+    tasks = []
     
     # Base processing with appropriate parser (pdfplumber)
-    parsers = {
-        'pdf': PDFParser(),
-        'word': WordParser(),
-        'excel': ExcelParser(),
-        'powerpoint': PPTParser()
-    }
-    parser = parsers.get(file_type)
+    parser = get_parser(file_type)
     if parser:
-        base_result = parser.parse(file_path)
-        base_result["processing_time"] = time.time()
-        base_result["processor"] = "base_parser_pdfplumber"
-        results.append(base_result)
+        if file_bytes is not None:
+            # PDF: parse the upload bytes already in memory
+            tasks.append(("base_parser_pdfplumber", lambda: parser.parse(file_path, data=file_bytes)))
+        else:
+            tasks.append(("base_parser_pdfplumber", lambda: parser.parse(file_path)))
     
     # Additional PDF parsers for comparison (PDF only)
     if file_type == 'pdf':
-        # PyMuPDF parser (fast and accurate)
-        try:
-            from processing.parsers.pdf_pymupdf_parser import PyMuPDFParser
-            pymupdf_parser = PyMuPDFParser()
-            pymupdf_result = pymupdf_parser.parse(file_path)
-            if "error" not in pymupdf_result:
-                pymupdf_result["processing_time"] = time.time()
-                pymupdf_result["processor"] = "pymupdf_parser"
-                results.append(pymupdf_result)
-        except ImportError:
-            pass
-        
-        # PDFMiner parser (good for text extraction)
-        try:
-            from processing.parsers.pdf_pdfminer_parser import PDFMinerParser
-            pdfminer_parser = PDFMinerParser()
-            pdfminer_result = pdfminer_parser.parse(file_path)
-            if "error" not in pdfminer_result:
-                pdfminer_result["processing_time"] = time.time()
-                pdfminer_result["processor"] = "pdfminer_parser"
-                results.append(pdfminer_result)
-        except (ImportError, Exception):
-            pass
-        
-        # pypdf parser (modern PyPDF2 successor)
-        try:
-            from processing.parsers.pdf_pypdf_parser import PyPDFParser
-            pypdf_parser = PyPDFParser()
-            pypdf_result = pypdf_parser.parse(file_path)
-            if "error" not in pypdf_result:
-                pypdf_result["processing_time"] = time.time()
-                pypdf_result["processor"] = "pypdf_parser"
-                results.append(pypdf_result)
-        except (ImportError, Exception):
-            pass
+        tasks += _optional_parser_tasks(PDF_COMPARISON_PARSERS, file_path, file_bytes)
     
     # AI processing
-    ai_processor = DocumentAIProcessor()
-    ai_result = ai_processor.process(file_path, file_type)
-    ai_result["processing_time"] = time.time()
-    results.append(ai_result)
+    tasks.append(("document_ai", lambda: get_doc_ai().process(file_path, file_type)))
     
     # Text curation processing (NeMo Curator-inspired)
     if use_curator:
-        try:
-            from processing.processors.curator_processor import CuratorProcessor
-            curator_processor = CuratorProcessor(
-                enable_cleaning=True,
-                enable_quality_check=True,
-                enable_language_detection=True
-            )
-            curator_result = curator_processor.process(file_path, file_type)
-            if "error" not in curator_result:
-                curator_result["processing_time"] = time.time()
-                curator_result["processor"] = "curator_processor"
-                results.append(curator_result)
-        except (ImportError, Exception) as e:
-            pass
+        tasks.append(("curator_processor", lambda: _run_curator(file_path, file_type)))
     
     # Ensemble processing
     if use_ensemble:
-        ensemble_processor = EnsembleProcessor()
-        ensemble_result = ensemble_processor.process(file_path, file_type)
-        ensemble_result["processing_time"] = time.time()
-        results.append(ensemble_result)
+        tasks.append(("ensemble_processor", lambda: get_ensemble().process(file_path, file_type)))
     
-    # Additional PDF parsers for table extraction (PDF only) - Optional
+    # Additional PDF parsers for table extraction and OCR (PDF only) - Optional
     if file_type == 'pdf':
-        # Camelot parser (table extraction) - requires Java and OpenCV
-        try:
-            from processing.parsers.pdf_camelot_parser import CamelotParser
-            camelot_parser = CamelotParser()
-            camelot_result = camelot_parser.parse(file_path)
-            if "error" not in camelot_result and camelot_result.get("tables"):
-                camelot_result["processing_time"] = time.time()
-                camelot_result["processor"] = "camelot_parser"
-                results.append(camelot_result)
-        except (ImportError, Exception) as e:
-            pass
-        
-        # Tabula parser (table extraction) - requires Java
-        try:
-            from processing.parsers.pdf_tabula_parser import TabulaParser
-            tabula_parser = TabulaParser()
-            tabula_result = tabula_parser.parse(file_path)
-            if "error" not in tabula_result and tabula_result.get("tables"):
-                tabula_result["processing_time"] = time.time()
-                tabula_result["processor"] = "tabula_parser"
-                results.append(tabula_result)
-        except (ImportError, Exception) as e:
-            pass
-        
-        # EasyOCR parser (better OCR alternative, no external dependencies)
-        try:
-            from processing.parsers.pdf_easyocr_parser import EasyOCRParser
-            easyocr_parser = EasyOCRParser()
-            if easyocr_parser.reader is not None:  # Only use if reader initialized successfully
-                easyocr_result = easyocr_parser.parse(file_path)
-                if "error" not in easyocr_result and (easyocr_result.get("text") or easyocr_result.get("pages")):
-                    easyocr_result["processing_time"] = time.time()
-                    easyocr_result["processor"] = "easyocr_parser"
-                    results.append(easyocr_result)
-        except (ImportError, Exception) as e:
-            pass
-        
-        # OCR parser (for scanned PDFs) - requires Tesseract (fallback)
-        try:
-            from processing.parsers.pdf_ocr_parser import OCRParser
-            ocr_parser = OCRParser()
-            ocr_result = ocr_parser.parse(file_path)
-            if "error" not in ocr_result:
-                ocr_result["processing_time"] = time.time()
-                ocr_result["processor"] = "ocr_parser"
-                results.append(ocr_result)
-        except (ImportError, Exception) as e:
-            pass
-        
-        # Unstructured parser (advanced document structure extraction)
-        try:
-            from processing.parsers.pdf_unstructured_parser import UnstructuredParser
-            unstructured_parser = UnstructuredParser()
-            unstructured_result = unstructured_parser.parse(file_path)
-            if "error" not in unstructured_result:
-                unstructured_result["processing_time"] = time.time()
-                unstructured_result["processor"] = "unstructured_parser"
-                results.append(unstructured_result)
-        except (ImportError, Exception) as e:
-            pass
-        
-        # PDFQuery parser (CSS-like selectors for structured PDFs)
-        try:
-            from processing.parsers.pdf_pdfquery_parser import PDFQueryParser
-            pdfquery_parser = PDFQueryParser()
-            pdfquery_result = pdfquery_parser.parse(file_path)
-            if "error" not in pdfquery_result:
-                pdfquery_result["processing_time"] = time.time()
-                pdfquery_result["processor"] = "pdfquery_parser"
-                results.append(pdfquery_result)
-        except (ImportError, Exception) as e:
-            pass
+        tasks += _optional_parser_tasks(PDF_EXTRACTION_PARSERS, file_path, file_bytes)
     
-    # Ollama processing
-    if use_ollama and ollama_model:
-        ollama_processor = OllamaProcessor(ollama_model)
-        if ollama_processor.is_available():
-            ollama_result = ollama_processor.process_document(file_path, file_type)
-            if ollama_result and "error" not in ollama_result:
-                ollama_result["processing_time"] = time.time()
-                ollama_result["processor"] = f"ollama_{ollama_model}"
-                results.append(ollama_result)
+    # Ollama processing (slow LLM inference) runs in the background;
+    # its result is merged into the file later by collect_background_results.
+    # Images are streamed in the script thread instead (stream_ollama_image).
+    task_cache = get_task_cache()
+    pending = {}
+    if use_ollama and ollama_model and file_type != "image":
+        ollama_name = f"ollama_{ollama_model}"
+        pending[ollama_name] = get_background_executor().submit(
+            run_cached_task, task_cache, metadata.file_hash, file_type, ollama_name,
+            task_options(ollama_name), lambda: _run_ollama(file_path, file_type, ollama_model)
+        )
+    
+    # Run all tasks concurrently; results are collected in task order.
+    # Tasks still running at the deadline are skipped instead of blocking the file.
+    results = []
+    executor = ThreadPoolExecutor(max_workers=min(len(tasks), MAX_TASK_WORKERS))
+    try:
+        futures = [
+            (name, executor.submit(run_cached_task, task_cache, metadata.file_hash, file_type,
+                                   name, task_options(name), task))
+            for name, task in tasks
+        ]
+        deadline = time.monotonic() + TASK_TIMEOUT
+        for processor_name, future in futures:
+            try:
+                result = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                continue
+            if result is None:
+                continue
+            if "file_path" in result:
+                # Cached results may come from an earlier upload of the same bytes
+                result["file_path"] = file_path
+            result["processor"] = processor_name
+            results.append(result)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # Filter out results with errors or empty results
-    valid_results = [r for r in results if "error" not in r and (r.get("text") or r.get("tables") or r.get("pages") or r.get("metadata"))]
+    valid_results = [r for r in results if _is_valid_result(r)]
     
     # Score and sort results by quality
     sorted_results = comparator.score_and_sort_results(valid_results)
     
-    # Save results
-    saved_files = []
-    original_filename = metadata.get("original_name", "")
-    for result in sorted_results:
-        processor_name = result.get("processor") or result.get("parser")
-        if not processor_name:
-            continue  # Skip results without processor name
-        saved_path = storage.save_result(
-            result,
-            metadata["file_id"],
-            processor_name,
-            output_format,
-            original_filename=original_filename
-        )
-        saved_files.append(saved_path)
+    # Save results (results without processor name are skipped)
+    storage.save_results(
+        sorted_results,
+        metadata.file_id,
+        output_format,
+        original_filename=metadata.original_name
+    )
+    
+    # 전체 결과는 디스크에 저장하고 세션에는 경로만 보관 (보기/비교 시 load_file_results로 로드)
+    results_path = storage.save_session_results(sorted_results, metadata.file_id)
     
     # 파일 결과 반환 (점수 순으로 정렬된 결과)
     file_result = {
-        "file_id": metadata["file_id"],
-        "file_name": metadata["original_name"],
-        "file_type": metadata["file_type"],
-        "results": sorted_results,  # 점수 순으로 정렬된 결과
-        "metadata": metadata
+        "file_id": metadata.file_id,
+        "file_name": metadata.original_name,
+        "file_type": metadata.file_type,
+        "results_path": results_path,  # 오류/빈 결과를 제외하고 점수 순으로 정렬된 결과
+        "result_count": len(sorted_results),
+        "metadata": metadata,
+        "output_format": output_format,
+        "pending": pending  # 처리 중인 백그라운드 작업 (processor name -> future)
     }
     
     return file_result
 
 
+@functools.lru_cache(maxsize=8)
+def _read_file_results(results_path, mtime_ns):
+    return get_storage().load_result(Path(results_path))
+
+
+def results_version(file_info):
+    """(results path, mtime) of a processed file; changes whenever its results are rewritten"""
+    results_path = str(file_info["results_path"])
+    try:
+        return results_path, os.stat(results_path).st_mtime_ns
+    except OSError:
+        return results_path, None
+
+
+def load_file_results(file_info):
+    """Full results of a processed file, loaded from disk (recent files stay cached)"""
+    results_path, mtime_ns = results_version(file_info)
+    if mtime_ns is None:
+        return []
+    return _read_file_results(results_path, mtime_ns)
+
+
+def delete_file_results(file_info):
+    """Remove the saved result files of a processed file"""
+    get_storage().delete_results_for_file(file_info["file_id"])
+    try:
+        os.unlink(file_info["results_path"])
+    except OSError:
+        pass
+
+
+def collect_background_results(file_info):
+    """Merge finished background tasks into a processed file; True if any finished"""
+    pending = file_info.get("pending")
+    if not pending:
+        return False
+    finished = [name for name, future in pending.items() if future.done()]
+    new_results = []
+    for processor_name in finished:
+        future = pending.pop(processor_name)
+        try:
+            result = future.result()
+        except Exception:
+            result = None
+        if result is not None:
+            new_results.append((processor_name, result))
+    merge_results(file_info, new_results)
+    return bool(finished)
+
+
+def merge_results(file_info, new_results):
+    """Save (processor name, result) pairs that finished after the file and re-rank its results"""
+    valid_results = []
+    for processor_name, result in new_results:
+        if not _is_valid_result(result):
+            continue
+        result["processor"] = processor_name
+        valid_results.append(result)
+        get_storage().save_result(
+            result, file_info["file_id"], processor_name, file_info["output_format"],
+            original_filename=file_info["file_name"]
+        )
+    if valid_results:
+        results = comparator.score_and_sort_results(load_file_results(file_info) + valid_results)
+        file_info["results_path"] = get_storage().save_session_results(results, file_info["file_id"])
+        file_info["result_count"] = len(results)
+
+
+def stream_ollama_image(file_info, ollama_model):
+    """Show an image's Ollama answer as it is generated (script thread), then merge it into the file"""
+    ollama = get_ollama(ollama_model)
+    ollama_name = f"ollama_{ollama_model}"
+    metadata = file_info["metadata"]
+    
+    def stream():
+        with st.status(f"Ollama 처리 중: {file_info['file_name']}", expanded=True) as status:
+            text = st.write_stream(ollama.stream_image(metadata.file_path))
+            status.update(label=f"Ollama 처리 완료: {file_info['file_name']}", state="complete", expanded=False)
+        # Same shape as OllamaProcessor.process_document for images, plus the answer as
+        # "text" so it is saved, scored and shown like the parser results
+        return {
+            "file_path": metadata.file_path,
+            "file_type": metadata.file_type,
+            "model": ollama.model,
+            "text": text,
+            "ollama_processing": {
+                "success": True,
+                "response": text,
+                "model": ollama.model,
+                "image_path": metadata.file_path
+            }
+        }
+    
+    # A cached answer for the same image is merged without calling the model again
+    result = run_cached_task(get_task_cache(), metadata.file_hash, metadata.file_type, ollama_name,
+                             task_options(ollama_name), stream)
+    result["file_path"] = metadata.file_path
+    merge_results(file_info, [(ollama_name, result)])
+
+
+@st.fragment(run_every=2)
+def watch_background_tasks():
+    """Poll background tasks; rerun the app once a result has been merged in"""
+    waiting_files = [f for f in st.session_state.processed_files.values() if f.get("pending")]
+    if not waiting_files:
+        return
+    finished = [collect_background_results(f) for f in waiting_files]
+    if any(finished):
+        st.rerun(scope="app")
+    st.info(f"⏳ Ollama 처리 중... ({len(waiting_files)}개 파일)")
+
+
+def processed_file_options():
+    """Selectbox labels for processed files, keyed by file_id"""
+    return {
+        file_id: f"{f['file_name']} ({f['file_type']})"
+        for file_id, f in st.session_state.processed_files.items()
+    }
+
+
+def select_processed_file(label, key, file_options):
+    """Pick one processed file; the selectbox is shown only when there are several"""
+    if len(file_options) == 1:
+        return next(iter(st.session_state.processed_files.values()))
+    selected_file_id = st.selectbox(
+        label,
+        options=list(file_options),
+        format_func=file_options.get,
+        key=key
+    )
+    return st.session_state.processed_files[selected_file_id]
+
+
+def result_markdown_bytes(result, storage):
+    """UTF-8 markdown of one result for downloads (rendered when the download is requested)"""
+    return storage._dict_to_markdown(result).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=64)
+def _saved_result_markdown(results_path, mtime_ns, index):
+    # Saved results never change under the same (path, mtime), so the markdown
+    # is keyed on that instead of hashing the result's content
+    result = _read_file_results(results_path, mtime_ns)[index]
+    return get_storage()._dict_to_markdown(result).encode('utf-8')
+
+
+def result_downloads(sorted_results, storage, default_name="processor", version=None):
+    """
+    (processor_name, safe_name, result, markdown) per result, in score order;
+    markdown is a zero-argument callable returning the MD bytes (cached per
+    saved result when the results version is given)
+    """
+    downloads = []
+    for i, result in enumerate(sorted_results):
+        processor_name = result.get("processor") or result.get("parser") or f"{default_name}_{i+1}"
+        if version is not None and version[1] is not None:
+            markdown = functools.partial(_saved_result_markdown, version[0], version[1], i)
+        else:
+            markdown = functools.partial(result_markdown_bytes, result, storage)
+        downloads.append((processor_name, processor_file_name(processor_name), result, markdown))
+    return downloads
+
+
+def _serialize_download(download):
+    _, safe_name, result, markdown = download
+    return safe_name, result_json_bytes(result), markdown()
+
+
+def build_results_zip(downloads, safe_base_name):
+    """ZIP of every result as JSON + MD, built in a spooled temp file (spills to disk when large)"""
+    # Results are serialized on a few threads; the archive itself is written sequentially
+    if len(downloads) > 1:
+        with ThreadPoolExecutor(max_workers=min(ZIP_SERIALIZE_WORKERS, len(downloads))) as executor:
+            entries = list(executor.map(_serialize_download, downloads))
+    else:
+        entries = [_serialize_download(download) for download in downloads]
+    
+    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE) as spool:
+        with zipfile.ZipFile(spool, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as zip_file:
+            # JSON/MD 파일들 추가 (점수 높은 순서대로)
+            for safe_name, json_bytes, md_bytes in entries:
+                for extension, data in (("json", json_bytes), ("md", md_bytes)):
+                    compress_type = zipfile.ZIP_STORED if len(data) < ZIP_STORE_MAX_SIZE else zipfile.ZIP_DEFLATED
+                    zip_file.writestr(f"{safe_base_name}_{safe_name}.{extension}", data, compress_type=compress_type)
+        
+        spool.seek(0)
+        return spool.read()
+
+
+# cache_resource hands back the cached bytes object itself; cache_data would
+# unpickle a fresh copy of the whole archive on every hit
+@st.cache_resource(max_entries=16, show_spinner=False)
+def cached_results_zip(file_id, version, safe_base_name, _downloads):
+    """build_results_zip once per (file, results version); repeat downloads reuse the bytes"""
+    return build_results_zip(_downloads, safe_base_name)
+
+
+@st.fragment
+def render_processed_files():
+    """Processed file list with view/delete buttons (deletes rerun only this fragment)"""
+    # 삭제 성공 메시지 표시
+    if 'delete_success_message' in st.session_state and st.session_state.delete_success_message:
+        st.success(st.session_state.delete_success_message)
+        del st.session_state.delete_success_message
+    
+    # 처리된 파일 리스트 표시
+    if st.session_state.processed_files:
+        st.subheader("📋 처리된 파일 목록")
+        for file_info in list(st.session_state.processed_files.values()):
+            col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+            with col1:
+                file_icon = FILE_ICONS.get(file_info["file_type"], "📎")
+                st.write(f"{file_icon} **{file_info['file_name']}** ({file_info['file_type']})")
+            with col2:
+                st.write(f"`{file_info['result_count']}개 결과`")
+            with col3:
+                if st.button("보기", key=f"view_{file_info['file_id']}"):
+                    st.session_state.processing_results = load_file_results(file_info)
+                    st.session_state.file_metadata = file_info["metadata"]
+                    st.session_state.current_file_id = file_info["file_id"]
+                    st.rerun()
+            with col4:
+                if st.button("🗑️ 삭제", key=f"delete_{file_info['file_id']}"):
+                    try:
+                        upload_handler = get_upload_handler()
+                        session_id = file_info["metadata"].session_id
+                        if not session_id:
+                            file_path = Path(file_info["metadata"].file_path)
+                            if file_path.parent.name != "uploads":
+                                session_id = file_path.parent.name
+                        
+                        upload_handler.delete_file(file_info["file_id"], session_id)
+                        delete_file_results(file_info)
+                        
+                        del st.session_state.processed_files[file_info["file_id"]]
+                        
+                        deleted_current = st.session_state.current_file_id == file_info["file_id"]
+                        if deleted_current:
+                            if st.session_state.processed_files:
+                                first_file = next(iter(st.session_state.processed_files.values()))
+                                st.session_state.processing_results = load_file_results(first_file)
+                                st.session_state.file_metadata = first_file["metadata"]
+                                st.session_state.current_file_id = first_file["file_id"]
+                            else:
+                                st.session_state.processing_results = []
+                                st.session_state.file_metadata = None
+                                st.session_state.current_file_id = None
+                        
+                        st.session_state.delete_success_message = f"파일이 삭제되었습니다: {file_info['file_name']}"
+                        # 현재 보고 있던 파일이 삭제된 경우에만 전체 앱을 다시 실행
+                        st.rerun(scope="app" if deleted_current else "fragment")
+                    except Exception as e:
+                        st.error(f"파일 삭제 중 오류 발생: {str(e)}")
+            st.divider()
+
+
 def main():
     st.title("📄 문서 전처리 서비스")
     st.markdown("---")
@@ -285,7 +905,7 @@ def main():
             st.subheader("Ollama 설정")
             ollama_model = st.selectbox(
                 "모델 선택",
-                options=OLLAMA_MODELS["multimodal"] + OLLAMA_MODELS["text"],
+                options=OLLAMA_MODEL_OPTIONS,
                 index=0
             )
         else:
@@ -295,10 +915,15 @@ def main():
         st.subheader("출력 형식")
         output_format = st.selectbox("저장 형식", OUTPUT_FORMATS, index=0)
         
+        # 오류 발생 시 상세 traceback 표시
+        debug_mode = st.checkbox("디버그 모드", value=False)
+        
         st.markdown("---")
         st.info(f"권장 모델: {OLLAMA_MODELS['recommended']}")
     
     # Main content area
+    # 파일 선택 목록 (탭 2~4의 선택 상자가 공유)
+    file_options = processed_file_options()
     tab1, tab2, tab3, tab4 = st.tabs(["📤 파일 업로드", "🔄 처리 결과", "📊 비교 분석", "📥 다운로드"])
     
     with tab1:
@@ -309,65 +934,8 @@ def main():
             st.success(st.session_state.last_success_message)
             del st.session_state.last_success_message
         
-        # 삭제 성공 메시지 표시
-        if 'delete_success_message' in st.session_state and st.session_state.delete_success_message:
-            st.success(st.session_state.delete_success_message)
-            del st.session_state.delete_success_message
-        
-        # 처리된 파일 리스트 표시
-        if st.session_state.processed_files:
-            st.subheader("📋 처리된 파일 목록")
-            for idx, file_info in enumerate(st.session_state.processed_files):
-                col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
-                with col1:
-                    file_icon = "📄" if file_info["file_type"] == "pdf" else "📝" if file_info["file_type"] == "word" else "📊" if file_info["file_type"] == "excel" else "📑" if file_info["file_type"] == "powerpoint" else "📎"
-                    st.write(f"{file_icon} **{file_info['file_name']}** ({file_info['file_type']})")
-                with col2:
-                    st.write(f"`{len(file_info['results'])}개 결과`")
-                with col3:
-                    if st.button("보기", key=f"view_{file_info['file_id']}"):
-                        st.session_state.processing_results = file_info["results"]
-                        st.session_state.file_metadata = file_info["metadata"]
-                        st.session_state.current_file_id = file_info["file_id"]
-                        st.rerun()
-                with col4:
-                    if st.button("🗑️ 삭제", key=f"delete_{file_info['file_id']}"):
-                        try:
-                            upload_handler = FileUploadHandler()
-                            session_id = file_info["metadata"].get("session_id")
-                            if not session_id:
-                                file_path = Path(file_info["metadata"]["file_path"])
-                                if file_path.parent.name != "uploads":
-                                    session_id = file_path.parent.name
-                            
-                            upload_handler.delete_file(file_info["file_id"], session_id)
-                            
-                            storage = StorageManager()
-                            result_files = storage.get_results_for_file(file_info["file_id"])
-                            for result_file in result_files:
-                                try:
-                                    result_file.unlink()
-                                except:
-                                    pass
-                            
-                            st.session_state.processed_files.pop(idx)
-                            
-                            if st.session_state.current_file_id == file_info["file_id"]:
-                                if st.session_state.processed_files:
-                                    first_file = st.session_state.processed_files[0]
-                                    st.session_state.processing_results = first_file["results"]
-                                    st.session_state.file_metadata = first_file["metadata"]
-                                    st.session_state.current_file_id = first_file["file_id"]
-                                else:
-                                    st.session_state.processing_results = []
-                                    st.session_state.file_metadata = None
-                                    st.session_state.current_file_id = None
-                            
-                            st.session_state.delete_success_message = f"파일이 삭제되었습니다: {file_info['file_name']}"
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"파일 삭제 중 오류 발생: {str(e)}")
-                st.divider()
+        # 처리된 파일 리스트 표시 (삭제 시 이 영역만 다시 그림)
+        render_processed_files()
         
         # 여러 파일 업로드 지원
         # 업로더 key 초기화
@@ -387,11 +955,11 @@ def main():
             st.subheader(f"📎 선택된 파일 ({len(uploaded_files)}개)")
             for idx, file in enumerate(uploaded_files):
                 col1, col2, col3 = st.columns([3, 1, 1])
+                file_type = get_file_type(file.name)
                 with col1:
-                    file_icon = "📄" if file.name.lower().endswith('.pdf') else "📝" if file.name.lower().endswith(('.doc', '.docx')) else "📊" if file.name.lower().endswith(('.xls', '.xlsx')) else "📑" if file.name.lower().endswith(('.ppt', '.pptx')) else "📎"
+                    file_icon = FILE_ICONS.get(file_type, "📎")
                     st.write(f"{file_icon} **{file.name}** ({file.size / 1024:.2f} KB)")
                 with col2:
-                    file_type = get_file_type(file.name)
                     st.write(f"`{file_type or '알 수 없음'}`")
                 with col3:
                     st.write("✅ 준비됨")
@@ -400,61 +968,98 @@ def main():
             # Upload button
             if st.button(f"📤 {len(uploaded_files)}개 파일 업로드 및 처리 시작", type="primary", key="upload_button"):
                 try:
-                    upload_handler = FileUploadHandler()
-                    storage = StorageManager()
+                    upload_handler = get_upload_handler()
+                    storage = get_storage()
                     
                     processed_count = 0
                     failed_files = []
+                    last_file = None
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
+                    # Ollama 서버 확인은 배치당 한 번 (사용 불가하면 이번 배치에서는 건너뜀)
+                    if use_ollama and ollama_model and not ollama_available(ollama_model):
+                        st.warning("⚠️ Ollama 서버에 연결할 수 없어 Ollama 처리를 건너뜁니다.")
+                        use_ollama = False
+                    
+                    # 중복 파일 정리 (기존 파일과 같은 파일명/내용이면 기존 파일을 제거하고 새로 처리)
+                    pending_files = []
+                    batch_keys = set()
+                    # (파일명, 내용 해시) -> 기존 파일 정보 (배치당 한 번만 구성)
+                    existing_files = {
+                        (f["file_name"], f["metadata"].file_hash): f
+                        for f in st.session_state.processed_files.values()
+                    }
+                    # 업로드 파일 내용 해시는 한 번에 병렬로 계산
+                    upload_hashes = get_bytes_hashes([uploaded_file.getbuffer() for uploaded_file in uploaded_files])
                     for file_idx, uploaded_file in enumerate(uploaded_files):
                         try:
-                            status_text.text(f"처리 중: {uploaded_file.name} ({file_idx + 1}/{len(uploaded_files)})")
-                            progress_bar.progress((file_idx) / len(uploaded_files))
+                            file_session_id = f"{st.session_state.session_id}_{datetime.now().strftime('%H%M%S%f')}_{file_idx}"
                             
-                            file_session_id = f"{st.session_state.session_id}_{datetime.now().strftime('%H%M%S%f')}"
-                            
-                            # 파일명과 크기로 중복 체크 (같은 파일명과 크기면 기존 파일로 간주)
-                            existing_file_index = next(
-                                (i for i, f in enumerate(st.session_state.processed_files) 
-                                 if f["file_name"] == uploaded_file.name 
-                                 and f["metadata"].get("file_size") == uploaded_file.size), 
-                                None
-                            )
+                            # 파일명과 내용 해시로 중복 체크 (같은 파일명과 내용이면 기존 파일로 간주)
+                            upload_hash = upload_hashes[file_idx]
+                            if (uploaded_file.name, upload_hash) in batch_keys:
+                                continue  # 같은 배치에서 중복 선택된 파일은 한 번만 처리
+                            batch_keys.add((uploaded_file.name, upload_hash))
+                            old_file_info = existing_files.get((uploaded_file.name, upload_hash))
                             
                             # 중복 파일이면 기존 파일을 제거하고 새로 처리
-                            if existing_file_index is not None:
+                            if old_file_info is not None:
                                 # 기존 파일 삭제
-                                old_file_info = st.session_state.processed_files[existing_file_index]
                                 try:
-                                    upload_handler.delete_file(old_file_info["file_id"], old_file_info["metadata"].get("session_id"))
+                                    upload_handler.delete_file(old_file_info["file_id"], old_file_info["metadata"].session_id)
                                     # 기존 결과 파일도 삭제
-                                    old_result_files = storage.get_results_for_file(old_file_info["file_id"])
-                                    for result_file in old_result_files:
-                                        try:
-                                            result_file.unlink()
-                                        except:
-                                            pass
+                                    delete_file_results(old_file_info)
                                 except:
                                     pass
-                                # 리스트에서 제거
-                                st.session_state.processed_files.pop(existing_file_index)
-                            
-                            # 파일 처리
-                            file_result = process_single_file(
-                                uploaded_file, upload_handler, storage, file_session_id,
-                                use_ensemble, use_curator, use_ollama, ollama_model, output_format
-                            )
-                            
-                            # 새 파일을 리스트에 추가 (항상 추가, 중복은 이미 제거됨)
-                            st.session_state.processed_files.append(file_result)
+                                # 목록에서 제거
+                                del st.session_state.processed_files[old_file_info["file_id"]]
                             
-                            processed_count += 1
+                            pending_files.append((file_idx, uploaded_file, file_session_id, upload_hash))
                             
                         except Exception as e:
                             failed_files.append((uploaded_file.name, str(e)))
                     
+                    # 파일 처리 (여러 파일을 동시에 처리, 완료되는 대로 진행률 갱신)
+                    file_results = {}
+                    if pending_files:
+                        with ThreadPoolExecutor(max_workers=min(len(pending_files), MAX_FILE_WORKERS)) as executor:
+                            file_futures = {
+                                executor.submit(
+                                    process_single_file,
+                                    uploaded_file, upload_handler, storage, file_session_id,
+                                    use_ensemble, use_curator, use_ollama, ollama_model, output_format,
+                                    upload_hash
+                                ): (file_idx, uploaded_file)
+                                for file_idx, uploaded_file, file_session_id, upload_hash in pending_files
+                            }
+                            for done_count, future in enumerate(as_completed(file_futures), start=1):
+                                file_idx, uploaded_file = file_futures[future]
+                                status_text.text(f"처리 완료: {uploaded_file.name} ({done_count}/{len(pending_files)})")
+                                progress_bar.progress(done_count / len(pending_files))
+                                try:
+                                    file_results[file_idx] = future.result()
+                                except Exception as e:
+                                    failed_files.append((uploaded_file.name, str(e)))
+                    
+                    # 새 파일을 업로드 순서대로 목록에 추가 (항상 추가, 중복은 이미 제거됨)
+                    for file_idx in sorted(file_results):
+                        file_result = file_results[file_idx]
+                        st.session_state.processed_files[file_result["file_id"]] = file_result
+                        last_file = file_result
+                        processed_count += 1
+                    
+                    # 이미지의 Ollama 답변은 생성되는 대로 화면에 표시 (스크립트 스레드에서 스트리밍)
+                    if use_ollama and ollama_model:
+                        for file_idx in sorted(file_results):
+                            file_result = file_results[file_idx]
+                            if file_result["file_type"] != "image":
+                                continue
+                            try:
+                                stream_ollama_image(file_result, ollama_model)
+                            except Exception as e:
+                                failed_files.append((f"{file_result['file_name']} (Ollama)", str(e)))
+                    
                     progress_bar.progress(1.0)
                     status_text.empty()
                     
@@ -470,14 +1075,12 @@ def main():
                             st.error(f"❌ {file_name}: {error}")
                     
                     # 마지막 처리된 파일을 현재 파일로 설정
-                    if st.session_state.processed_files:
-                        # 새로 처리된 파일들 중 마지막 파일
-                        newly_processed_files = st.session_state.processed_files[-processed_count:] if processed_count > 0 else st.session_state.processed_files
-                        if newly_processed_files:
-                            last_file = newly_processed_files[-1]
-                            st.session_state.processing_results = last_file["results"]
-                            st.session_state.file_metadata = last_file["metadata"]
-                            st.session_state.current_file_id = last_file["file_id"]
+                    if last_file is None and st.session_state.processed_files:
+                        last_file = next(reversed(st.session_state.processed_files.values()))
+                    if last_file is not None:
+                        st.session_state.processing_results = load_file_results(last_file)
+                        st.session_state.file_metadata = last_file["metadata"]
+                        st.session_state.current_file_id = last_file["file_id"]
                     
                     # 파일 업로더 초기화를 위해 key 변경
                     st.session_state.file_uploader_key = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
@@ -486,80 +1089,39 @@ def main():
                     
                 except Exception as e:
                     st.error(f"❌ 오류 발생: {str(e)}")
-                    import traceback
-                    st.code(traceback.format_exc())
+                    if debug_mode:
+                        import traceback
+                        st.code(traceback.format_exc())
     
     with tab2:
         st.header("처리 결과")
         
+        # 백그라운드 작업(Ollama)이 남아 있으면 완료될 때까지 주기적으로 확인
+        if any(f.get("pending") for f in st.session_state.processed_files.values()):
+            watch_background_tasks()
+        
         # 여러 파일이 처리된 경우 선택할 수 있도록
         if st.session_state.processed_files:
-            if len(st.session_state.processed_files) > 1:
-                file_options = [f"{f['file_name']} ({f['file_type']})" for f in st.session_state.processed_files]
-                selected_file_index = st.selectbox(
-                    "처리된 파일 선택",
-                    options=range(len(st.session_state.processed_files)),
-                    format_func=lambda x: file_options[x],
-                    key="file_selector"
-                )
-                selected_file = st.session_state.processed_files[selected_file_index]
-                st.session_state.processing_results = selected_file["results"]
-                st.session_state.file_metadata = selected_file["metadata"]
-                st.session_state.current_file_id = selected_file["file_id"]
-            else:
-                selected_file = st.session_state.processed_files[0]
-                st.session_state.processing_results = selected_file["results"]
-                st.session_state.file_metadata = selected_file["metadata"]
-                st.session_state.current_file_id = selected_file["file_id"]
+            selected_file = select_processed_file("처리된 파일 선택", "file_selector", file_options)
+            st.session_state.processing_results = load_file_results(selected_file)
+            st.session_state.file_metadata = selected_file["metadata"]
+            st.session_state.current_file_id = selected_file["file_id"]
         
         if st.session_state.processing_results:
-            # 에러가 있는 결과 필터링
-            valid_results = [r for r in st.session_state.processing_results 
-                           if "error" not in r and (r.get("text") or r.get("tables") or r.get("pages") or r.get("metadata"))]
-            
-            if not valid_results:
-                st.warning("유효한 처리 결과가 없습니다. 파일을 다시 업로드해주세요.")
-                return
-            
-            # 점수 순으로 정렬된 결과 표시
-            sorted_display_results = comparator.score_and_sort_results(valid_results)
-            
-            for i, result in enumerate(sorted_display_results):
+            # process_single_file에서 이미 필터링/점수 순 정렬된 결과를 그대로 표시
+            for i, result in enumerate(st.session_state.processing_results):
                 processor_name = result.get("processor") or result.get("parser")
                 if not processor_name:
                     continue  # 프로세서 이름이 없는 결과는 건너뛰기
                 
-                name_mapping = {
-                    "pdf_parser": "PDF Parser (pdfplumber)",
-                    "pymupdf_parser": "PDF Parser (PyMuPDF)",
-                    "pdfminer_parser": "PDF Parser (pdfminer)",
-                    "pypdf_parser": "PDF Parser (pypdf)",
-                    "easyocr_parser": "PDF Parser (EasyOCR - Better OCR)",
-                    "ocr_parser": "PDF Parser (OCR - Tesseract)",
-                    "unstructured_parser": "PDF Parser (Unstructured - Advanced)",
-                    "pdfquery_parser": "PDF Parser (PDFQuery - CSS Selectors)",
-                    "camelot_parser": "PDF Parser (Camelot - Tables)",
-                    "tabula_parser": "PDF Parser (Tabula - Tables)",
-                    "document_ai": "Document AI Processor",
-                    "curator_processor": "Text Curator (NeMo Curator-inspired)",
-                    "ensemble_processor": "Ensemble Processor",
-                    "base_parser_pdfplumber": "Base Parser (pdfplumber)",
-                    "word_parser": "Word Parser",
-                    "excel_parser": "Excel Parser",
-                    "ppt_parser": "PowerPoint Parser"
-                }
-                if processor_name.startswith("ollama_"):
-                    model_name = processor_name.replace("ollama_", "")
-                    processor_name = f"Ollama AI ({model_name})"
-                else:
-                    processor_name = name_mapping.get(processor_name, processor_name)
+                processor_name = processor_display_name(processor_name)
                 
                 with st.expander(f"📋 {processor_name} 결과", expanded=(i == 0)):
                     if result.get("text"):
                         st.subheader("추출된 텍스트")
                         st.text_area(
                             "텍스트 내용",
-                            value=result["text"][:5000] + ("..." if len(result["text"]) > 5000 else ""),
+                            value=text_preview(result["text"]),
                             height=200,
                             disabled=True,
                             key=f"text_area_{i}_{processor_name}"
@@ -587,7 +1149,7 @@ def main():
                     
                     if result.get("metadata"):
                         st.subheader("메타데이터")
-                        st.json(result["metadata"])
+                        st.json(fast_json(result["metadata"]))
                     
                     if result.get("tables"):
                         st.subheader("추출된 테이블")
@@ -599,7 +1161,11 @@ def main():
                         for k, sheet in enumerate(result["sheets"][:3]):
                             st.write(f"**시트명**: {sheet['sheet_name']}")
                             if sheet.get("data"):
-                                st.dataframe(sheet["data"][:100], key=f"sheet_{i}_{k}")
+                                sheet_rows = sheet["data"][:100]
+                                if not isinstance(sheet_rows[0], dict):
+                                    # 행 리스트 형식: 열 이름은 column_names에 따로 저장됨
+                                    sheet_rows = pd.DataFrame(sheet_rows, columns=sheet.get("column_names"))
+                                st.dataframe(sheet_rows, key=f"sheet_{i}_{k}")
         else:
             st.info("처리된 결과가 없습니다. 파일을 업로드하고 처리해주세요.")
     
@@ -607,27 +1173,16 @@ def main():
         st.header("비교 분석")
         
         if st.session_state.processed_files:
-            if len(st.session_state.processed_files) > 1:
-                file_options = [f"{f['file_name']} ({f['file_type']})" for f in st.session_state.processed_files]
-                selected_file_index = st.selectbox(
-                    "비교할 파일 선택",
-                    options=range(len(st.session_state.processed_files)),
-                    format_func=lambda x: file_options[x],
-                    key="comparison_file_selector"
-                )
-                selected_file = st.session_state.processed_files[selected_file_index]
-                comparison_results = selected_file["results"]
-            else:
-                comparison_results = st.session_state.processed_files[0]["results"]
+            selected_file = select_processed_file("비교할 파일 선택", "comparison_file_selector", file_options)
+            comparison_results = load_file_results(selected_file)
         else:
             comparison_results = st.session_state.processing_results
         
         if len(comparison_results) > 1 and use_comparison:
-            comparison = comparator.compare_results(comparison_results)
+            comparison = compare_results_cached(comparison_key(comparison_results), comparison_results)
             
             if comparison.get("comparison_metrics"):
-                import pandas as pd
-                df = pd.DataFrame(comparison["comparison_metrics"])
+                df = build_metrics_dataframe(comparison["comparison_metrics"])
                 st.dataframe(df, key="comparison_metrics_df")
             
             if comparison.get("recommendations"):
@@ -639,24 +1194,23 @@ def main():
                 st.subheader("최적 처리기")
                 best = comparison["best_processor"]
                 st.success(f"**{best['processor']}** (점수: {best['score']:.2f})")
-                st.json(best["metrics"])
+                st.json(fast_json(best["metrics"]))
             
             if st.button("비교 결과 저장", key="save_comparison_button"):
-                storage = StorageManager()
+                storage = get_storage()
                 if st.session_state.processed_files:
                     if len(st.session_state.processed_files) > 1:
-                        selected_file_index = st.session_state.get("comparison_file_selector", 0)
-                        file_id = st.session_state.processed_files[selected_file_index]["file_id"]
+                        file_id = st.session_state.get("comparison_file_selector")
                     else:
-                        file_id = st.session_state.processed_files[0]["file_id"]
+                        file_id = next(iter(st.session_state.processed_files))
                 elif st.session_state.file_metadata:
-                    file_id = st.session_state.file_metadata["file_id"]
+                    file_id = st.session_state.file_metadata.file_id
                 else:
                     st.error("파일 정보를 찾을 수 없습니다.")
                     file_id = None
                 
                 if file_id:
-                    saved_path = storage.save_comparison_result(comparison, file_id)
+                    saved_path = storage.save_comparison_result(comparison, file_id, pretty=True)
                     st.success(f"비교 결과가 저장되었습니다: {saved_path.name}")
         else:
             st.info("비교를 위해 최소 2개 이상의 처리 결과가 필요합니다.")
@@ -664,25 +1218,13 @@ def main():
     with tab4:
         st.header("다운로드")
         
-        storage = StorageManager()
+        storage = get_storage()
         
         if st.session_state.processed_files:
-            if len(st.session_state.processed_files) > 1:
-                file_options = [f"{f['file_name']} ({f['file_type']})" for f in st.session_state.processed_files]
-                selected_file_index = st.selectbox(
-                    "다운로드할 파일 선택",
-                    options=range(len(st.session_state.processed_files)),
-                    format_func=lambda x: file_options[x],
-                    key="download_file_selector"
-                )
-                selected_file = st.session_state.processed_files[selected_file_index]
-                file_id = selected_file["file_id"]
-                file_name = selected_file["file_name"]
-                processing_results = selected_file["results"]
-            else:
-                file_id = st.session_state.processed_files[0]["file_id"]
-                file_name = st.session_state.processed_files[0]["file_name"]
-                processing_results = st.session_state.processed_files[0]["results"]
+            selected_file = select_processed_file("다운로드할 파일 선택", "download_file_selector", file_options)
+            file_id = selected_file["file_id"]
+            file_name = selected_file["file_name"]
+            processing_results = load_file_results(selected_file)
             
             result_files = storage.get_results_for_file(file_id)
             
@@ -691,64 +1233,31 @@ def main():
                 
                 # 파일별로 정리된 다운로드
                 base_filename = Path(file_name).stem
-                safe_base_name = "".join(c for c in base_filename if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+                safe_base_name = sanitize_filename(base_filename)
                 
-                # 프로세서 이름 매핑
-                name_mapping = {
-                    "pdf_parser": "pdfplumber",
-                    "pymupdf_parser": "pymupdf",
-                    "pdfminer_parser": "pdfminer",
-                    "pypdf_parser": "pypdf",
-                    "easyocr_parser": "easyocr",
-                    "ocr_parser": "ocr_tesseract",
-                    "unstructured_parser": "unstructured",
-                    "pdfquery_parser": "pdfquery",
-                    "camelot_parser": "camelot",
-                    "tabula_parser": "tabula",
-                    "document_ai": "document_ai",
-                    "ensemble_processor": "ensemble",
-                    "base_parser_pdfplumber": "base_pdfplumber",
-                    "word_parser": "word",
-                    "excel_parser": "excel",
-                    "ppt_parser": "powerpoint"
-                }
-                
-                # 점수 순으로 정렬된 결과 사용
-                sorted_results = comparator.score_and_sort_results(processing_results)
+                # 저장된 결과는 이미 점수 순으로 정렬되어 있음 (process_single_file)
+                # JSON/MD/ZIP 데이터는 다운로드 버튼을 누를 때만 생성 (callable data)
+                version = results_version(selected_file)
+                downloads = result_downloads(processing_results, storage, version=version)
                 
                 # 개별 파일 다운로드 (점수 높은 순서대로)
                 st.write("**개별 결과 다운로드 (점수 순):**")
-                for i, result in enumerate(sorted_results):
-                    processor_name = result.get("processor") or result.get("parser") or f"processor_{i+1}"
-                    
-                    if processor_name.startswith("ollama_"):
-                        safe_name = processor_name.replace("ollama_", "ollama_")
-                    else:
-                        safe_name = name_mapping.get(processor_name, processor_name.replace(" ", "_").lower())
-                    
-                    display_name = name_mapping.get(processor_name, processor_name)
-                    if processor_name.startswith("ollama_"):
-                        display_name = f"Ollama ({processor_name.replace('ollama_', '')})"
-                    
+                for i, (processor_name, safe_name, result, markdown) in enumerate(downloads):
                     col1, col2, col3 = st.columns([3, 1, 1])
                     with col1:
-                        st.write(f"• {display_name}")
+                        st.write(f"• {processor_download_label(processor_name)}")
                     with col2:
-                        json_data = json.dumps(result, ensure_ascii=False, indent=2)
-                        json_bytes = json_data.encode('utf-8')
                         st.download_button(
                             "📥 JSON",
-                            json_bytes,
+                            functools.partial(result_json_bytes, result),
                             file_name=f"{safe_base_name}_{safe_name}.json",
                             key=f"json_download_{file_id}_{i}",
                             mime="application/json"
                         )
                     with col3:
-                        md_content = storage._dict_to_markdown(result)
-                        md_bytes = md_content.encode('utf-8')
                         st.download_button(
                             "📥 MD",
-                            md_bytes,
+                            markdown,
                             file_name=f"{safe_base_name}_{safe_name}.md",
                             key=f"md_download_{file_id}_{i}",
                             mime="text/markdown"
@@ -758,26 +1267,12 @@ def main():
                 
                 # 파일별 ZIP 다운로드 (모든 결과를 하나의 ZIP으로, 점수 순)
                 st.write("**전체 결과 ZIP 다운로드 (점수 순):**")
-                zip_buffer = BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                    # JSON 파일들 추가 (점수 높은 순서대로)
-                    for i, result in enumerate(sorted_results):
-                        processor_name = result.get("processor") or result.get("parser") or f"processor_{i+1}"
-                        if processor_name.startswith("ollama_"):
-                            safe_name = processor_name.replace("ollama_", "ollama_")
-                        else:
-                            safe_name = name_mapping.get(processor_name, processor_name.replace(" ", "_").lower())
-                        
-                        json_data = json.dumps(result, ensure_ascii=False, indent=2)
-                        zip_file.writestr(f"{safe_base_name}_{safe_name}.json", json_data.encode('utf-8'))
-                        
-                        md_content = storage._dict_to_markdown(result)
-                        zip_file.writestr(f"{safe_base_name}_{safe_name}.md", md_content.encode('utf-8'))
-                
-                zip_buffer.seek(0)
                 st.download_button(
                     "📦 전체 결과 ZIP 다운로드 (JSON + MD)",
-                    zip_buffer.getvalue(),
+                    functools.partial(
+                        cached_results_zip, file_id, version,
+                        safe_base_name, downloads
+                    ),
                     file_name=f"{safe_base_name}_all_results.zip",
                     key=f"zip_download_{file_id}",
                     mime="application/zip"
@@ -792,14 +1287,13 @@ def main():
                         with col1:
                             st.write(f"📄 {result_file.name}")
                         with col2:
-                            with open(result_file, "rb") as f:
-                                st.download_button(
-                                    "다운로드",
-                                    f.read(),
-                                    file_name=result_file.name,
-                                    key=f"download_saved_{file_id}_{result_file.name}",
-                                    mime="application/json" if result_file.suffix == ".json" else "text/markdown"
-                                )
+                            st.download_button(
+                                "다운로드",
+                                result_file.read_bytes,
+                                file_name=result_file.name,
+                                key=f"download_saved_{file_id}_{result_file.name}",
+                                mime=RESULT_MIME_TYPES.get(result_file.suffix, "text/markdown")
+                            )
             elif result_files:
                 st.subheader(f"저장된 결과 파일: {file_name}")
                 for result_file in result_files:
@@ -807,66 +1301,42 @@ def main():
                     with col1:
                         st.write(f"📄 {result_file.name}")
                     with col2:
-                        with open(result_file, "rb") as f:
-                            st.download_button(
-                                "다운로드",
-                                f.read(),
-                                file_name=result_file.name,
-                                key=f"download_{file_id}_{result_file.name}",
-                                mime="application/json" if result_file.suffix == ".json" else "text/markdown"
-                            )
+                        st.download_button(
+                            "다운로드",
+                            result_file.read_bytes,
+                            file_name=result_file.name,
+                            key=f"download_{file_id}_{result_file.name}",
+                            mime=RESULT_MIME_TYPES.get(result_file.suffix, "text/markdown")
+                        )
             else:
                 st.info("다운로드할 파일이 없습니다. 먼저 파일을 업로드하고 처리해주세요.")
         
         elif st.session_state.processing_results:
-            file_name = st.session_state.file_metadata.get("original_name", "unknown") if st.session_state.file_metadata else "unknown"
+            file_name = st.session_state.file_metadata.original_name if st.session_state.file_metadata else "unknown"
             st.subheader("처리 결과 다운로드")
             
             base_filename = Path(file_name).stem
-            safe_base_name = "".join(c for c in base_filename if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
-            
-            name_mapping = {
-                "pdf_parser": "pdfplumber",
-                "pymupdf_parser": "pymupdf",
-                "pdfminer_parser": "pdfminer",
-                "pypdf_parser": "pypdf",
-                "easyocr_parser": "easyocr",
-                "ocr_parser": "ocr_tesseract",
-                "unstructured_parser": "unstructured",
-                "pdfquery_parser": "pdfquery",
-                "camelot_parser": "camelot",
-                "tabula_parser": "tabula",
-                "document_ai": "document_ai",
-                "ensemble_processor": "ensemble",
-                "base_parser_pdfplumber": "base_pdfplumber"
-            }
+            safe_base_name = sanitize_filename(base_filename)
             
-            # 점수 순으로 정렬
-            sorted_results = comparator.score_and_sort_results(st.session_state.processing_results)
+            # 저장된 결과는 이미 점수 순으로 정렬되어 있음 (process_single_file)
+            downloads = result_downloads(st.session_state.processing_results, storage, default_name="Processor")
             
-            for i, result in enumerate(sorted_results):
-                processor_name = result.get("processor") or result.get("parser") or f"Processor_{i+1}"
-                safe_name = name_mapping.get(processor_name, processor_name.replace(" ", "_").lower())
-                
+            for i, (processor_name, safe_name, result, markdown) in enumerate(downloads):
                 col1, col2, col3 = st.columns([3, 1, 1])
                 with col1:
                     st.write(f"**{processor_name}**")
                 with col2:
-                    json_data = json.dumps(result, ensure_ascii=False, indent=2)
-                    json_bytes = json_data.encode('utf-8')
                     st.download_button(
                         "📥 JSON",
-                        json_bytes,
+                        functools.partial(result_json_bytes, result),
                         file_name=f"{safe_base_name}_{safe_name}.json",
                         key=f"json_download_direct_{i}",
                         mime="application/json"
                     )
                 with col3:
-                    md_content = storage._dict_to_markdown(result)
-                    md_bytes = md_content.encode('utf-8')
                     st.download_button(
                         "📥 MD",
-                        md_bytes,
+                        markdown,
                         file_name=f"{safe_base_name}_{safe_name}.md",
                         key=f"md_download_direct_{i}",
                         mime="text/markdown"
@@ -874,7 +1344,7 @@ def main():
                 st.divider()
         
         elif st.session_state.file_metadata:
-            file_id = st.session_state.file_metadata["file_id"]
+            file_id = st.session_state.file_metadata.file_id
             result_files = storage.get_results_for_file(file_id)
             
             if result_files:
@@ -884,14 +1354,13 @@ def main():
                     with col1:
                         st.write(f"📄 {result_file.name}")
                     with col2:
-                        with open(result_file, "rb") as f:
-                            st.download_button(
-                                "다운로드",
-                                f.read(),
-                                file_name=result_file.name,
-                                key=f"download_{result_file.name}",
-                                mime="application/json" if result_file.suffix == ".json" else "text/markdown"
-                            )
+                        st.download_button(
+                            "다운로드",
+                            result_file.read_bytes,
+                            file_name=result_file.name,
+                            key=f"download_{result_file.name}",
+                            mime=RESULT_MIME_TYPES.get(result_file.suffix, "text/markdown")
+                        )
             else:
                 st.info("다운로드할 파일이 없습니다. 먼저 파일을 업로드하고 처리해주세요.")
         else:
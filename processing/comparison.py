@@ -1,8 +1,7 @@
 """
 Compare results from different processors
 """
-from typing import Dict, List
-import json
+from typing import Dict, List, Tuple
 
 
 class ResultComparator:
@@ -31,25 +30,14 @@ class ResultComparator:
             "recommendations": []
         }
         
-        # Extract text from all results
-        texts = []
-        for result in results:
-            text = result.get("text", "")
-            if not text and result.get("pages"):
-                # Extract from pages
-                text = "\n".join([page.get("text", "") for page in result.get("pages", [])])
-            if not text and result.get("sheets"):
-                # Extract from sheets
-                text = json.dumps([sheet.get("data", []) for sheet in result.get("sheets", [])])
-            texts.append(text)
-        
         # Calculate metrics
         metrics = []
-        for i, (result, text) in enumerate(zip(results, texts)):
+        for i, result in enumerate(results):
+            text_length, word_count = self._text_stats(result)
             metric = {
                 "processor": result.get("parser") or result.get("processor", f"processor_{i}"),
-                "text_length": len(text),
-                "word_count": len(text.split()) if text else 0,
+                "text_length": text_length,
+                "word_count": word_count,
                 "has_errors": "error" in result,
                 "has_tables": len(result.get("tables", [])) > 0 or len(result.get("sheets", [])) > 0,
                 "has_metadata": "metadata" in result and bool(result["metadata"]),
@@ -69,35 +57,81 @@ class ResultComparator:
         
         return comparison
     
+    @staticmethod
+    def _text_stats(result: Dict) -> Tuple[int, int]:
+        """(character count, word count) of the text a result extracted"""
+        text = result.get("text", "")
+        if not text and result.get("pages"):
+            # Extract from pages
+            text = "\n".join([page.get("text", "") for page in result.get("pages", [])])
+        if text:
+            return len(text), len(text.split())
+        if result.get("sheets"):
+            # Count sheet cells directly instead of joining them into one string
+            text_length = 0
+            word_count = 0
+            for sheet in result["sheets"]:
+                for row in sheet.get("data", []):
+                    for value in (row.values() if isinstance(row, dict) else row):
+                        if value is None:
+                            continue  # empty cell
+                        cell = value if isinstance(value, str) else str(value)
+                        text_length += len(cell)
+                        word_count += len(cell.split())
+            return text_length, word_count
+        return 0, 0
+    
     def _generate_recommendations(self, metrics: List[Dict], results: List[Dict]) -> List[str]:
         """Generate recommendations based on comparison"""
         recommendations = []
         
-        # Find processor with most text extracted
-        max_text = max(m.get("text_length", 0) for m in metrics)
-        best_text_processor = next((m["processor"] for m in metrics if m["text_length"] == max_text), None)
+        # One pass over the metrics collects everything the recommendations need
+        best_text_metric = None
+        fastest = None
+        timed_count = 0
+        error_processors = []
+        table_processors = []
+        metadata_processors = []
+        for m in metrics:
+            if best_text_metric is None or m.get("text_length", 0) > best_text_metric.get("text_length", 0):
+                best_text_metric = m
+            # processing_time is a measured duration in seconds
+            if m.get("processing_time") and not m["has_errors"]:
+                timed_count += 1
+                if fastest is None or m["processing_time"] < fastest["processing_time"]:
+                    fastest = m
+            if m["has_errors"]:
+                error_processors.append(m["processor"])
+            if m["has_tables"]:
+                table_processors.append(m["processor"])
+            if m["has_metadata"]:
+                metadata_processors.append(m["processor"])
+        
+        # Processor with most text extracted
+        if best_text_metric is not None and best_text_metric["processor"]:
+            recommendations.append(
+                f"'{best_text_metric['processor']}' extracted the most text ({best_text_metric.get('text_length', 0)} characters)"
+            )
         
-        if best_text_processor:
+        # Fastest processor
+        if timed_count > 1:
             recommendations.append(
-                f"'{best_text_processor}' extracted the most text ({max_text} characters)"
+                f"'{fastest['processor']}' was the fastest ({fastest['processing_time']:.2f}s)"
             )
         
         # Check for errors
-        error_processors = [m["processor"] for m in metrics if m["has_errors"]]
         if error_processors:
             recommendations.append(
                 f"Warning: The following processors encountered errors: {', '.join(error_processors)}"
             )
         
         # Check for table extraction
-        table_processors = [m["processor"] for m in metrics if m["has_tables"]]
         if table_processors:
             recommendations.append(
                 f"For documents with tables, consider using: {', '.join(table_processors)}"
             )
         
         # Check for metadata
-        metadata_processors = [m["processor"] for m in metrics if m["has_metadata"]]
         if metadata_processors:
             recommendations.append(
                 f"For document metadata extraction, consider using: {', '.join(metadata_processors)}"
@@ -110,36 +144,64 @@ class ResultComparator:
         if not metrics:
             return {}
         
-        # Score each processor
-        scored = []
-        for metric in metrics:
-            score = 0
-            
-            # Higher text length is better
-            score += metric.get("text_length", 0) / 1000
-            
-            # Having tables is good
-            if metric.get("has_tables"):
-                score += 10
-            
-            # Having metadata is good
-            if metric.get("has_metadata"):
-                score += 5
-            
-            # Errors reduce score
-            if metric.get("has_errors"):
-                score -= 50
-            
-            scored.append({
-                "processor": metric["processor"],
-                "score": score,
-                "metrics": metric
-            })
+        # Pick the highest-scoring processor (first one wins ties)
+        scores = [self._metric_score(metric) for metric in metrics]
+        best_index = max(range(len(scores)), key=scores.__getitem__)
+        best = metrics[best_index]
+        
+        return {
+            "processor": best["processor"],
+            "score": scores[best_index],
+            "metrics": best
+        }
+    
+    @staticmethod
+    def _metric_score(metric: Dict) -> float:
+        """Overall score for one processor's comparison metrics"""
+        score = 0
+        
+        # Higher text length is better
+        score += metric.get("text_length", 0) / 1000
+        
+        # Having tables is good
+        if metric.get("has_tables"):
+            score += 10
+        
+        # Having metadata is good
+        if metric.get("has_metadata"):
+            score += 5
+        
+        # Errors reduce score
+        if metric.get("has_errors"):
+            score -= 50
         
-        # Sort by score
-        scored.sort(key=lambda x: x["score"], reverse=True)
+        return score
+    
+    @staticmethod
+    def _result_score(result: Dict) -> float:
+        """Quality score for one processing result"""
+        score = 0
+        
+        # Text length score
+        score += len(result.get("text", "")) / 1000
+        
+        # Tables score
+        if result.get("tables") or result.get("sheets"):
+            score += 10
+        
+        # Metadata score
+        if result.get("metadata"):
+            score += 5
         
-        return scored[0] if scored else {}
+        # Error penalty
+        if "error" in result:
+            score -= 50
+        
+        # Statistics bonus (from AI processor)
+        if result.get("statistics"):
+            score += 3
+        
+        return score
     
     def score_and_sort_results(self, results: List[Dict]) -> List[Dict]:
         """
@@ -151,43 +213,7 @@ class ResultComparator:
         Returns:
             Sorted list of results (best first)
         """
-        if not results:
-            return []
-        
-        # Calculate scores
-        scored_results = []
-        for result in results:
-            score = 0
-            text = result.get("text", "")
-            
-            # Text length score
-            score += len(text) / 1000
-            
-            # Tables score
-            if result.get("tables") or result.get("sheets"):
-                score += 10
-            
-            # Metadata score
-            if result.get("metadata"):
-                score += 5
-            
-            # Error penalty
-            if "error" in result:
-                score -= 50
-            
-            # Statistics bonus (from AI processor)
-            if result.get("statistics"):
-                score += 3
-            
-            scored_results.append({
-                "result": result,
-                "score": score
-            })
-        
-        # Sort by score (descending)
-        scored_results.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Return sorted results
-        return [item["result"] for item in scored_results]
+        # Sort by score (descending); each result is scored once and ties keep their order
+        return sorted(results, key=self._result_score, reverse=True)
 
 
@@ -3,11 +3,12 @@ Text curation module inspired by NVIDIA NeMo Curator
 Provides quality filtering, deduplication, and text cleaning capabilities
 """
 import re
-import hashlib
 from typing import Dict, List, Optional, Set
 from collections import Counter
 import unicodedata
 
+import numpy as np
+
 try:
     import langdetect
     from langdetect import detect, detect_langs
@@ -17,11 +18,53 @@ except ImportError:
 
 try:
     from sentence_transformers import SentenceTransformer
-    import numpy as np
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Fuzzy dedup switches from a full similarity matrix to a FAISS range search at this many texts
+FAISS_MIN_TEXTS = 1000
+
+# clean_text patterns, compiled once (clean_text runs on every document's full text)
+_WHITESPACE_RE = re.compile(r'\s+')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f-\x9f]')
+# Runs of !/? (3+) and dots (4+), collapsed in one pass
+_EXCESS_PUNCT_RE = re.compile(r'!{3,}|\?{3,}|\.{4,}')
+# One character class instead of a repeated alternation (same characters: '$-_' is
+# the range $..._ and already covers digits, capitals, '%', '@', '.', '&', '+' etc.)
+_URL_RE = re.compile(r'https?://[a-zA-Z0-9$-_@.&+!*\\(),%]+')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Texts at least this long count distinct characters with a code point bitmap
+# instead of a set of 1-char strings (the set is faster for short texts)
+CHAR_BITMAP_MIN_LENGTH = 4096
+
+# Characters that are neither word characters nor whitespace (assess_quality)
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\s]+')
+
+
+def _count_unique_chars(text: str) -> int:
+    """Number of distinct characters in text"""
+    if len(text) < CHAR_BITMAP_MIN_LENGTH:
+        return len(set(text))
+    # surrogatepass: PDF extraction can leave lone surrogates, which set() counts too
+    code_points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    # Bitmap only as large as the highest code point present (Hangul text: ~55 KB, not 1.1 MB)
+    seen = np.zeros(int(code_points.max()) + 1, dtype=bool)
+    seen[code_points] = True
+    return int(np.count_nonzero(seen))
+
+
+def _collapse_punct(match) -> str:
+    char = match.group()[0]
+    return '...' if char == '.' else char
+
 
 class TextCurator:
     """
@@ -41,6 +84,16 @@ class TextCurator:
                 self.embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
             except Exception:
                 self.embedding_model = None
+        
+        # Run embedding inference on the GPU in half precision when requested and available
+        if self.embedding_model is not None and self.use_gpu:
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    self.embedding_model = self.embedding_model.to('cuda').half()
+            except Exception:
+                # Keep the CPU (FP32) model
+                pass
     
     def clean_text(self, text: str) -> Dict[str, any]:
         """
@@ -69,24 +122,22 @@ class TextCurator:
         cleaned = unicodedata.normalize('NFKC', cleaned)
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned)
         
         # Remove control characters (except newlines and tabs)
-        cleaned = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f-\x9f]', '', cleaned)
+        cleaned = _CONTROL_CHARS_RE.sub('', cleaned)
         
         # Remove excessive punctuation
-        cleaned = re.sub(r'[!]{3,}', '!', cleaned)
-        cleaned = re.sub(r'[?]{3,}', '?', cleaned)
-        cleaned = re.sub(r'[.]{4,}', '...', cleaned)
+        cleaned = _EXCESS_PUNCT_RE.sub(_collapse_punct, cleaned)
         
         # Remove URLs
-        cleaned = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', cleaned)
+        cleaned = _URL_RE.sub('', cleaned)
         
         # Remove email addresses
-        cleaned = re.sub(r'\S+@\S+', '', cleaned)
+        cleaned = _EMAIL_RE.sub('', cleaned)
         
         # Remove excessive line breaks
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
+        cleaned = _EXCESS_NEWLINES_RE.sub('\n\n', cleaned)
         
         # Strip leading/trailing whitespace
         cleaned = cleaned.strip()
@@ -126,10 +177,11 @@ class TextCurator:
         passed_filters = []
         failed_filters = []
         
-        # Length check
+        # Length check (the text is split into words once and reused below)
+        words = text.split()
         text_length = len(text)
-        word_count = len(text.split())
-        char_count = len(text.replace(' ', ''))
+        word_count = len(words)
+        char_count = text_length - text.count(' ')
         
         metrics["length"] = text_length
         metrics["word_count"] = word_count
@@ -148,7 +200,7 @@ class TextCurator:
             failed_filters.append("minimum_words")
         
         # Character diversity (unique chars / total chars)
-        unique_chars = len(set(text.lower()))
+        unique_chars = _count_unique_chars(text.lower())
         char_diversity = unique_chars / max(len(text), 1)
         metrics["char_diversity"] = round(char_diversity, 3)
         
@@ -158,7 +210,6 @@ class TextCurator:
             failed_filters.append("char_diversity")
         
         # Repetition check (check for excessive repetition)
-        words = text.split()
         if len(words) > 0:
             word_freq = Counter(words)
             max_freq = max(word_freq.values())
@@ -171,7 +222,8 @@ class TextCurator:
                 failed_filters.append("high_repetition")
         
         # Special character ratio
-        special_chars = len(re.findall(r'[^\w\s]', text))
+        # Count by how much removing them shortens the text (no per-match list)
+        special_chars = text_length - len(_SPECIAL_CHAR_RE.sub('', text))
         special_char_ratio = special_chars / max(len(text), 1)
         metrics["special_char_ratio"] = round(special_char_ratio, 3)
         
@@ -276,15 +328,15 @@ class TextCurator:
         
         original_count = len(texts)
         deduplicated = []
-        seen_hashes = set()
+        seen_texts = set()
         duplicates = []
         
         if method == "exact":
-            # Exact deduplication using hash
+            # Exact deduplication: the set holds references to the texts themselves
+            # (str hashing is cached per object, no encode/digest per text)
             for text in texts:
-                text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-                if text_hash not in seen_hashes:
-                    seen_hashes.add(text_hash)
+                if text not in seen_texts:
+                    seen_texts.add(text)
                     deduplicated.append(text)
                 else:
                     duplicates.append(text)
@@ -292,34 +344,25 @@ class TextCurator:
         elif method == "fuzzy" and SENTENCE_TRANSFORMERS_AVAILABLE:
             # Fuzzy deduplication using embeddings
             if self.embedding_model:
-                embeddings = self.embedding_model.encode(texts, show_progress_bar=False)
+                # Unit-length embeddings, so one matrix product gives every cosine similarity
+                # (the model may run in FP16 on the GPU; similarities are computed in FP32)
+                embeddings = np.asarray(self.embedding_model.encode(
+                    texts, batch_size=128, show_progress_bar=False,
+                    convert_to_numpy=True, normalize_embeddings=True
+                ), dtype=np.float32)
                 
                 # Simple cosine similarity threshold
                 threshold = 0.95
-                seen_indices = set()
+                neighbors = self._similar_indices(embeddings, threshold)
+                kept = np.zeros(len(texts), dtype=bool)
                 
+                # Keep a text unless it is too similar to one already kept
                 for i, text in enumerate(texts):
-                    if i in seen_indices:
-                        continue
-                    
-                    is_duplicate = False
-                    for j, dedup_text in enumerate(deduplicated):
-                        if j in seen_indices:
-                            continue
-                        
-                        # Calculate cosine similarity
-                        similarity = np.dot(embeddings[i], embeddings[j]) / (
-                            np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[j])
-                        )
-                        
-                        if similarity >= threshold:
-                            is_duplicate = True
-                            duplicates.append(text)
-                            break
-                    
-                    if not is_duplicate:
+                    if kept[neighbors[i]].any():
+                        duplicates.append(text)
+                    else:
                         deduplicated.append(text)
-                        seen_indices.add(i)
+                        kept[i] = True
             else:
                 # Fallback to exact if model not available
                 return self.deduplicate_texts(texts, method="exact")
@@ -339,6 +382,23 @@ class TextCurator:
             "method": method
         }
     
+    def _similar_indices(self, embeddings, threshold: float) -> List:
+        """
+        For each unit-length embedding, the indices of embeddings at least threshold similar
+        
+        Small batches use one matrix product; large ones use a FAISS range search
+        so the N x N similarity matrix is never built
+        """
+        if FAISS_AVAILABLE and len(embeddings) >= FAISS_MIN_TEXTS:
+            vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+            index = faiss.IndexFlatIP(vectors.shape[1])
+            index.add(vectors)
+            lims, _, ids = index.range_search(vectors, threshold)
+            return [ids[lims[i]:lims[i + 1]] for i in range(len(vectors))]
+        
+        similarities = embeddings @ embeddings.T
+        return [np.flatnonzero(row >= threshold) for row in similarities]
+    
     def curate_text(self, text: str, enable_cleaning: bool = True, 
                    enable_quality_check: bool = True, 
                    enable_language_detection: bool = True) -> Dict[str, any]:
@@ -2,12 +2,67 @@
 Ollama integration for multi-modal document processing
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
-from typing import Dict, Optional, List
+import functools
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, List, Tuple
 from pathlib import Path
-import json
 
-from config import OLLAMA_BASE_URL, OLLAMA_MODELS
+import orjson
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+from config import OLLAMA_BASE_URL, OLLAMA_MODELS, ensure_cache_dir
+
+# Seconds an is_available() answer is reused before /api/tags is probed again
+AVAILABILITY_TTL = 30
+# Requests in flight at once for process_texts/process_images; the server only runs
+# OLLAMA_NUM_PARALLEL of them concurrently (set that env var on the Ollama server)
+MAX_CONCURRENT_REQUESTS = 4
+# Image bytes base64-encoded per read (a multiple of 3, so chunks need no padding)
+BASE64_CHUNK_SIZE = 57 * 1024
+# Longest image side sent to vision models (LLaVA-style encoders work at about this size)
+MAX_IMAGE_SIDE = 1568
+# JPEG quality for images downscaled before upload
+JPEG_QUALITY = 85
+# Seconds an /api/tags model list is shared by every processor for the same server
+MODELS_CACHE_TTL = 60
+# How long the server keeps the model (and its prompt KV cache) loaded after a request
+KEEP_ALIVE = "30m"
+# Seconds a process_text response stays in the on-disk response cache
+RESPONSE_CACHE_EXPIRE = 7 * 24 * 3600
+# Model name fragments that mark a vision-capable model
+VISION_MODEL_MARKERS = ("llava", "bakllava", "vision", "minicpm-v", "moondream")
+# Prompt process_document and stream_image use for document images
+DOCUMENT_IMAGE_PROMPT = "Extract all text and describe the visual content of this document image:"
+
+# base_url -> (monotonic time fetched, model names)
+_models_cache: Dict[str, Tuple[float, List[str]]] = {}
+
+
+
+@functools.lru_cache(maxsize=None)
+def _response_cache() -> Optional["diskcache.Cache"]:
+    """On-disk cache of process_text responses shared by all processors (None without diskcache)"""
+    if not DISKCACHE_AVAILABLE:
+        return None
+    return diskcache.Cache(str(ensure_cache_dir() / "ollama"))
 
 
 class OllamaProcessor:
@@ -16,31 +71,140 @@ class OllamaProcessor:
     def __init__(self, model_name: Optional[str] = None):
         self.base_url = OLLAMA_BASE_URL
         self.model = model_name or OLLAMA_MODELS["recommended"]
+        # One keep-alive connection pool for every request to the Ollama server
+        # (retries cover connection setup only; generate POSTs are not replayed)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                              max_retries=Retry(total=3, backoff_factor=0.2))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._available: Optional[bool] = None
+        self._available_checked_at = 0.0
+        self.supports_vision = any(marker in self.model.lower() for marker in VISION_MODEL_MARKERS)
         self.available_models = self._get_available_models()
     
     def _get_available_models(self) -> List[str]:
-        """Get list of available Ollama models"""
+        """Get list of available Ollama models (shared across instances for MODELS_CACHE_TTL seconds)"""
+        cached = _models_cache.get(self.base_url)
+        if cached is not None and time.monotonic() - cached[0] < MODELS_CACHE_TTL:
+            return cached[1]
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
-                models = response.json().get("models", [])
-                return [model["name"] for model in models]
+                models = [model["name"] for model in orjson.loads(response.content).get("models", [])]
+                # Only successful answers are cached, so a server started later is picked up
+                _models_cache[self.base_url] = (time.monotonic(), models)
+                return models
         except Exception:
             pass
         return []
     
     def is_available(self) -> bool:
-        """Check if Ollama is available"""
+        """Check if Ollama is available (the answer is reused for AVAILABILITY_TTL seconds)"""
+        now = time.monotonic()
+        if self._available is not None and now - self._available_checked_at < AVAILABILITY_TTL:
+            return self._available
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            self._available = response.status_code == 200
         except Exception:
-            return False
+            self._available = False
+        self._available_checked_at = now
+        return self._available
+    
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
+    
+    def _downscaled_jpeg(self, image_path: str) -> Optional[bytes]:
+        """JPEG of the image shrunk to MAX_IMAGE_SIDE, or None if it is already small enough"""
+        if not PIL_AVAILABLE:
+            return None
+        try:
+            with Image.open(image_path) as image:
+                if max(image.size) <= MAX_IMAGE_SIDE:
+                    return None
+                image.draft("RGB", (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))  # JPEG: decode at reduced size
+                image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+                if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+                    # Flatten transparency onto white instead of letting it turn black
+                    rgba = image.convert("RGBA")
+                    flattened = Image.new("RGB", rgba.size, (255, 255, 255))
+                    flattened.paste(rgba, mask=rgba.getchannel("A"))
+                    image = flattened
+                buffer = io.BytesIO()
+                image.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY)
+                return buffer.getvalue()
+        except OSError:
+            # Not something Pillow can decode; send the file as is
+            return None
     
     def _encode_image(self, image_path: str) -> str:
-        """Encode image to base64"""
+        """Encode image to base64 (large images are downscaled first; others are read chunk by chunk)"""
+        jpeg = self._downscaled_jpeg(image_path)
+        if jpeg is not None:
+            return base64.b64encode(jpeg).decode('ascii')
+        
         with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+            size = os.fstat(image_file.fileno()).st_size
+            encoded = bytearray(4 * ((size + 2) // 3))
+            pos = 0
+            while True:
+                chunk = image_file.read(BASE64_CHUNK_SIZE)
+                if not chunk:
+                    break
+                piece = base64.b64encode(chunk)
+                encoded[pos:pos + len(piece)] = piece
+                pos += len(piece)
+        # pos only differs from the preallocated size if the file changed while reading
+        del encoded[pos:]
+        return encoded.decode('ascii')
+    
+    def _generate(self, payload: Dict, timeout: int, stream: bool = False) -> requests.Response:
+        """
+        Send an /api/generate request
+        
+        Without stream the whole answer comes back as one JSON object;
+        with stream the body is NDJSON chunks, read as the model produces them.
+        """
+        return self.session.post(
+            f"{self.base_url}/api/generate",
+            data=orjson.dumps({**payload, "model": self.model, "stream": stream, "keep_alive": KEEP_ALIVE}),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+            stream=stream
+        )
+    
+    def _read_generate(self, response: requests.Response) -> Dict:
+        """{"response": text} from a generate response, or {"error": ...} if the server reported one"""
+        try:
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            body = {}
+        if response.status_code != 200 or body.get("error"):
+            detail = body.get("error") or response.status_code
+            return {"error": f"Ollama API error: {detail}"}
+        return {"response": body.get("response", "")}
+    
+    def _iter_generate(self, response: requests.Response) -> Iterator[str]:
+        """Text pieces of a streamed generate response (RuntimeError if the server reports an error)"""
+        if response.status_code != 200:
+            raise RuntimeError(self._read_generate(response)["error"])
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            if chunk.get("error"):
+                # An error mid-stream means the text so far is incomplete
+                raise RuntimeError(f"Ollama API error: {chunk['error']}")
+            if chunk.get("response"):
+                yield chunk["response"]
+            if chunk.get("done"):
+                return
+    
+    def _text_payload(self, text: str, prompt: str) -> Dict:
+        """Generate payload with the instruction as the system prompt (a stable prefix the server's KV cache reuses)"""
+        return {"system": prompt, "prompt": text}
     
     def process_text(self, text: str, prompt: str = "Extract and summarize the key information from this document:") -> Dict:
         """
@@ -53,30 +217,33 @@ class OllamaProcessor:
         Returns:
             Processed result
         """
-        if not self.is_available():
-            return {"error": "Ollama service not available"}
+        # The same model, prompt and text always get the cached answer
+        cache = _response_cache()
+        cache_key = hashlib.sha256(
+            "\0".join((self.model, prompt, text)).encode("utf-8", "surrogatepass")
+        ).hexdigest()
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
         
+        # No /api/tags pre-flight: a refused connection on the generate request means the same
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": f"{prompt}\n\n{text}",
-                    "stream": False
-                },
-                timeout=60
-            )
+            generated = self._read_generate(self._generate(self._text_payload(text, prompt), timeout=60))
+            if "error" in generated:
+                return generated
             
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "response": result.get("response", ""),
-                    "model": self.model
-                }
-            else:
-                return {"error": f"Ollama API error: {response.status_code}"}
+            result = {
+                "success": True,
+                "response": generated["response"],
+                "model": self.model
+            }
+            if cache is not None:
+                cache.set(cache_key, result, expire=RESPONSE_CACHE_EXPIRE)
+            return result
         
+        except requests.ConnectionError:
+            return {"error": "Ollama service not available"}
         except Exception as e:
             return {"error": f"Failed to process with Ollama: {str(e)}"}
     
@@ -91,42 +258,86 @@ class OllamaProcessor:
         Returns:
             Processed result
         """
-        if not self.is_available():
-            return {"error": "Ollama service not available"}
-        
         # Check if model supports vision
-        if not any(model in self.model.lower() for model in ["llava", "bakllava", "vision"]):
+        if not self.supports_vision:
             return {"error": f"Model {self.model} does not support vision"}
         
         try:
             # Encode image
             image_base64 = self._encode_image(image_path)
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "images": [image_base64],
-                    "stream": False
-                },
-                timeout=120
+            generated = self._read_generate(
+                self._generate({"prompt": prompt, "images": [image_base64]}, timeout=120)
             )
+            if "error" in generated:
+                return generated
             
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "response": result.get("response", ""),
-                    "model": self.model,
-                    "image_path": image_path
-                }
-            else:
-                return {"error": f"Ollama API error: {response.status_code}"}
+            return {
+                "success": True,
+                "response": generated["response"],
+                "model": self.model,
+                "image_path": image_path
+            }
         
+        except requests.ConnectionError:
+            return {"error": "Ollama service not available"}
         except Exception as e:
             return {"error": f"Failed to process image with Ollama: {str(e)}"}
     
+    def stream_image(self, image_path: str, prompt: str = DOCUMENT_IMAGE_PROMPT) -> Iterator[str]:
+        """
+        Stream an image answer as the model produces it (for st.write_stream)
+        
+        Args:
+            image_path: Path to image file
+            prompt: Prompt for the model
+            
+        Yields:
+            Pieces of the answer text
+            
+        Raises:
+            RuntimeError: If the model has no vision support or the server reports an error
+        """
+        if not self.supports_vision:
+            raise RuntimeError(f"Model {self.model} does not support vision")
+        
+        image_base64 = self._encode_image(image_path)
+        with self._generate({"prompt": prompt, "images": [image_base64]}, timeout=120, stream=True) as response:
+            yield from self._iter_generate(response)
+    
+    def _map_concurrent(self, func, items: List) -> List[Dict]:
+        """Apply func to every item with up to MAX_CONCURRENT_REQUESTS requests in flight"""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(items))) as executor:
+            return list(executor.map(func, items))
+    
+    def process_texts(self, texts: List[str], prompt: str = "Extract and summarize the key information from this document:") -> List[Dict]:
+        """
+        Process several texts with overlapping requests
+        
+        Args:
+            texts: Texts to process
+            prompt: Prompt for the model (shared by all texts)
+            
+        Returns:
+            One process_text result per text, in input order
+        """
+        return self._map_concurrent(lambda text: self.process_text(text, prompt), texts)
+    
+    def process_images(self, image_paths: List[str], prompt: str = "Describe the content of this image in detail:") -> List[Dict]:
+        """
+        Process several images with overlapping requests
+        
+        Args:
+            image_paths: Paths to image files
+            prompt: Prompt for the model (shared by all images)
+            
+        Returns:
+            One process_image result per image, in input order
+        """
+        return self._map_concurrent(lambda image_path: self.process_image(image_path, prompt), image_paths)
+    
     def process_document(self, file_path: str, file_type: str, 
                         prompt: Optional[str] = None) -> Dict:
         """
@@ -149,8 +360,7 @@ class OllamaProcessor:
         
         # For images, use vision model
         if file_type == "image":
-            default_prompt = "Extract all text and describe the visual content of this document image:"
-            ollama_result = self.process_image(file_path, prompt or default_prompt)
+            ollama_result = self.process_image(file_path, prompt or DOCUMENT_IMAGE_PROMPT)
             result["ollama_processing"] = ollama_result
         
         # For text-based documents, extract text first then process
@@ -1,6 +1,8 @@
 """
 PDF document parser using Camelot - Specialized for table extraction
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from pathlib import Path
 try:
@@ -9,6 +11,40 @@ try:
 except ImportError:
     CAMELOT_AVAILABLE = False
 
+# Pages handed to one camelot.read_pdf call when a document is split up
+PAGES_PER_CHUNK = 10
+CAMELOT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _page_chunks(file_path: str) -> List[str]:
+    """Camelot page specs ("1-10", "11-20", ...) covering the whole document"""
+    try:
+        from pypdf import PdfReader
+        total_pages = len(PdfReader(file_path).pages)
+    except Exception:
+        return ["all"]
+    return [
+        f"{start}-{min(start + PAGES_PER_CHUNK - 1, total_pages)}"
+        for start in range(1, total_pages + 1, PAGES_PER_CHUNK)
+    ] or ["all"]
+
+
+def _read_tables(file_path: str) -> List:
+    """Lattice tables from every page, reading page chunks concurrently"""
+    chunks = _page_chunks(file_path)
+    if len(chunks) == 1:
+        return list(camelot.read_pdf(file_path, pages=chunks[0], flavor='lattice'))
+    
+    try:
+        with ThreadPoolExecutor(max_workers=min(CAMELOT_WORKERS, len(chunks))) as executor:
+            chunk_tables = list(executor.map(
+                lambda pages: camelot.read_pdf(file_path, pages=pages, flavor='lattice'), chunks
+            ))
+    except Exception:
+        # Some Ghostscript backends can't render concurrently; read the document in one call
+        return list(camelot.read_pdf(file_path, pages='all', flavor='lattice'))
+    return [table for tables in chunk_tables for table in tables]
+
 
 class CamelotParser:
     """Parse PDF documents using Camelot (table extraction focused)"""
@@ -41,7 +77,7 @@ class CamelotParser:
         
         try:
             # Extract tables from all pages
-            tables = camelot.read_pdf(file_path, pages='all', flavor='lattice')
+            tables = _read_tables(file_path)
             
             result["metadata"]["total_pages"] = len(set([t.page for t in tables]))
             result["metadata"]["method"] = "camelot"
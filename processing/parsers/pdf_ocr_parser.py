@@ -1,6 +1,9 @@
 """
 PDF document parser using OCR (Tesseract) for scanned PDFs
 """
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from pathlib import Path
 try:
@@ -10,6 +13,18 @@ try:
 except ImportError:
     OCR_AVAILABLE = False
 
+# Tesseract runs as a subprocess per page, so pages can be OCR'd on threads. Each
+# tesseract process already uses up to 4 OpenMP threads and several files may be OCR'd
+# at once, so only run a couple of pages side by side (and only with cores to spare)
+TESSERACT_OMP_THREADS = 4
+OCR_WORKERS = max(1, min((os.cpu_count() or 1) // TESSERACT_OMP_THREADS, 2))
+# LSTM engine only; page segmentation stays automatic (documents may have columns/tables)
+TESSERACT_CONFIG = "--oem 1"
+
+
+def _ocr_page(page_path: str) -> str:
+    return pytesseract.image_to_string(page_path, lang='kor+eng', config=TESSERACT_CONFIG)
+
 
 class OCRParser:
     """Parse PDF documents using OCR (for scanned PDFs)"""
@@ -40,25 +55,29 @@ class OCRParser:
             return result
         
         try:
-            # Convert PDF to images
-            images = convert_from_path(file_path)
-            
-            result["metadata"]["total_pages"] = len(images)
-            result["metadata"]["method"] = "OCR (Tesseract)"
-            
             full_text = []
-            for i, image in enumerate(images):
-                # Extract text using OCR
-                page_text = pytesseract.image_to_string(image, lang='kor+eng')
-                full_text.append(page_text)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Render pages to files; tesseract reads each file itself, so page
+                # images are never all held in memory
+                page_paths = convert_from_path(file_path, output_folder=temp_dir, paths_only=True, fmt="png")
+                
+                result["metadata"]["total_pages"] = len(page_paths)
+                result["metadata"]["method"] = "OCR (Tesseract)"
+                
+                # Extract text using OCR (several tesseract processes at once, results in page order)
+                with ThreadPoolExecutor(max_workers=max(1, min(OCR_WORKERS, len(page_paths)))) as executor:
+                    page_texts = list(executor.map(_ocr_page, page_paths))
                 
-                page_data = {
-                    "page_number": i + 1,
-                    "text": page_text,
-                    "tables": [],
-                    "ocr_confidence": "available"
-                }
-                result["pages"].append(page_data)
+                for i, page_text in enumerate(page_texts):
+                    full_text.append(page_text)
+                    
+                    page_data = {
+                        "page_number": i + 1,
+                        "text": page_text,
+                        "tables": [],
+                        "ocr_confidence": "available"
+                    }
+                    result["pages"].append(page_data)
             
             result["text"] = "\n\n".join(full_text)
             result["metadata"]["is_scanned"] = True
@@ -1,10 +1,11 @@
 """
 PDF document parser
 """
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+from io import BytesIO
 from pathlib import Path
-import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
 
 
 class PDFParser:
@@ -13,12 +14,44 @@ class PDFParser:
     def __init__(self):
         self.name = "pdf_parser"
     
-    def parse(self, file_path: str) -> Dict:
+    def iter_pages(self, file_path: str, data: Optional[bytes] = None) -> Iterator[Dict]:
+        """
+        Yield pdfplumber page data one page at a time
+        
+        Args:
+            file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
+            
+        Returns:
+            Iterator over {"page_number", "text", "tables"} dicts, in page order
+        """
+        with pdfplumber.open(BytesIO(data) if data is not None else file_path) as pdf:
+            for i, page in enumerate(pdf.pages):
+                page_text = page.extract_text() or ""
+                
+                # Extract tables if any. The default "lines" strategy builds tables from
+                # ruling lines, so a page without lines/rects/curves can't have any
+                if page.lines or page.rects or page.curves:
+                    tables = page.extract_tables()
+                else:
+                    tables = []
+                
+                # Drop the page's cached layout objects before moving on
+                page.close()
+                
+                yield {
+                    "page_number": i + 1,
+                    "text": page_text,
+                    "tables": tables if tables else []
+                }
+    
+    def parse(self, file_path: str, data: Optional[bytes] = None) -> Dict:
         """
         Parse PDF file and extract content
         
         Args:
             file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
             
         Returns:
             Dictionary with extracted content
@@ -33,38 +66,26 @@ class PDFParser:
         
         # Try pdfplumber first (better for tables and complex layouts)
         try:
-            with pdfplumber.open(file_path) as pdf:
-                result["metadata"]["total_pages"] = len(pdf.pages)
-                result["metadata"]["method"] = "pdfplumber"
-                
-                full_text = []
-                for i, page in enumerate(pdf.pages):
-                    page_text = page.extract_text() or ""
-                    full_text.append(page_text)
-                    
-                    # Extract tables if any
-                    tables = page.extract_tables()
-                    
-                    page_data = {
-                        "page_number": i + 1,
-                        "text": page_text,
-                        "tables": tables if tables else []
-                    }
-                    result["pages"].append(page_data)
-                
-                result["text"] = "\n\n".join(full_text)
+            result["pages"] = list(self.iter_pages(file_path, data))
+            result["metadata"]["total_pages"] = len(result["pages"])
+            result["metadata"]["method"] = "pdfplumber"
+            result["text"] = "\n\n".join(page["text"] for page in result["pages"])
         
         except Exception as e:
-            # Fallback to PyPDF2
+            # Fallback to PDFium (native text extraction, much faster than pure-Python readers)
             try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    result["metadata"]["total_pages"] = len(pdf_reader.pages)
-                    result["metadata"]["method"] = "PyPDF2"
+                pdf = pdfium.PdfDocument(data if data is not None else file_path)
+                try:
+                    result["metadata"]["total_pages"] = len(pdf)
+                    result["metadata"]["method"] = "pypdfium2"
                     
                     full_text = []
-                    for i, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text() or ""
+                    for i in range(len(pdf)):
+                        page = pdf[i]
+                        textpage = page.get_textpage()
+                        page_text = textpage.get_text_range().replace("\r\n", "\n")
+                        textpage.close()
+                        page.close()
                         full_text.append(page_text)
                         
                         page_data = {
@@ -77,10 +98,11 @@ class PDFParser:
                     result["text"] = "\n\n".join(full_text)
                     
                     # Extract metadata
-                    if pdf_reader.metadata:
-                        result["metadata"]["document_info"] = {
-                            k: str(v) for k, v in pdf_reader.metadata.items()
-                        }
+                    document_info = {k: v for k, v in pdf.get_metadata_dict().items() if v}
+                    if document_info:
+                        result["metadata"]["document_info"] = document_info
+                finally:
+                    pdf.close()
             
             except Exception as e2:
                 result["error"] = f"Failed to parse PDF: {str(e2)}"
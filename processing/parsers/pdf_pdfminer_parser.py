@@ -1,11 +1,12 @@
 """
 PDF document parser using pdfminer.six - Good for text extraction
 """
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+from io import BytesIO
 from pathlib import Path
 try:
-    from pdfminer.high_level import extract_text, extract_pages
-    from pdfminer.layout import LTTextContainer
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer, LTTextLineHorizontal
     PDFMINER_AVAILABLE = True
 except ImportError:
     PDFMINER_AVAILABLE = False
@@ -17,12 +18,66 @@ class PDFMinerParser:
     def __init__(self):
         self.name = "pdfminer_parser"
     
-    def parse(self, file_path: str) -> Dict:
+    def iter_pages(self, file_path: str, data: Optional[bytes] = None) -> Iterator[Dict]:
+        """
+        Yield page data one page at a time while pdfminer analyzes the document
+        
+        Args:
+            file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
+            
+        Returns:
+            Iterator over page dicts, in page order
+        """
+        for i, page_layout in enumerate(extract_pages(BytesIO(data) if data is not None else file_path)):
+            # Text of every text container on the page
+            element_texts = [
+                element.get_text() for element in page_layout if isinstance(element, LTTextContainer)
+            ]
+            
+            yield {
+                "page_number": i + 1,
+                "text": "".join(element_text + "\n" for element_text in element_texts),
+                "text_elements_count": len(element_texts),
+                "layout_info": "available"
+            }
+    
+    def extract_elements(self, file_path: str) -> List[List[Dict]]:
+        """
+        Extract the horizontal text lines of every page with their bounding boxes
+        
+        Args:
+            file_path: Path to PDF file
+            
+        Returns:
+            One list per page of {"text", "bbox": {"x0", "y0", "x1", "y1"}} dicts (blank lines skipped)
+        """
+        pages = []
+        for page_layout in extract_pages(file_path):
+            elements = []
+            for container in page_layout:
+                if not isinstance(container, LTTextContainer):
+                    continue
+                for line in container:
+                    if not isinstance(line, LTTextLineHorizontal):
+                        continue
+                    text = line.get_text().strip()
+                    if text:
+                        x0, y0, x1, y1 = line.bbox
+                        elements.append({
+                            "text": text,
+                            "bbox": {"x0": float(x0), "y0": float(y0), "x1": float(x1), "y1": float(y1)}
+                        })
+            pages.append(elements)
+        return pages
+    
+    def parse(self, file_path: str, data: Optional[bytes] = None) -> Dict:
         """
         Parse PDF file using pdfminer.six
         
         Args:
             file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
             
         Returns:
             Dictionary with extracted content
@@ -40,42 +95,13 @@ class PDFMinerParser:
             return result
         
         try:
-            # Extract full text
-            full_text = extract_text(file_path)
-            result["text"] = full_text
-            
-            # Extract pages with layout information
-            pages = list(extract_pages(file_path))
-            result["metadata"]["total_pages"] = len(pages)
+            # Extract pages with layout information (one pass; the full text is built from the pages)
             result["metadata"]["method"] = "pdfminer.six"
+            result["pages"] = list(self.iter_pages(file_path, data))
+            result["metadata"]["total_pages"] = len(result["pages"])
             
-            full_text_pages = []
-            for i, page_layout in enumerate(pages):
-                page_text = ""
-                text_elements = []
-                
-                # Extract text elements with position info
-                for element in page_layout:
-                    if isinstance(element, LTTextContainer):
-                        element_text = element.get_text()
-                        page_text += element_text + "\n"
-                        text_elements.append({
-                            "text": element_text.strip(),
-                            "bbox": element.bbox  # (x0, y0, x1, y1)
-                        })
-                
-                full_text_pages.append(page_text)
-                
-                page_data = {
-                    "page_number": i + 1,
-                    "text": page_text,
-                    "text_elements_count": len(text_elements),
-                    "layout_info": "available"
-                }
-                result["pages"].append(page_data)
-            
-            # Update full text with page-separated version
-            result["text"] = "\n\n--- Page Break ---\n\n".join(full_text_pages)
+            # Full text with page separators
+            result["text"] = "\n\n--- Page Break ---\n\n".join(page["text"] for page in result["pages"])
             
             result["metadata"]["extraction_method"] = "layout_aware"
         
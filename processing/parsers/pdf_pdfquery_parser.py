@@ -11,6 +11,8 @@ try:
 except ImportError:
     PDFQUERY_AVAILABLE = False
 
+from processing.parsers.pdf_pdfminer_parser import PDFMinerParser, PDFMINER_AVAILABLE
+
 
 class PDFQueryParser:
     """Parse PDF documents using pdfquery"""
@@ -38,6 +40,9 @@ class PDFQueryParser:
         }
         
         if not PDFQUERY_AVAILABLE:
+            if PDFMINER_AVAILABLE:
+                # Same text lines straight from pdfminer, without pdfquery's lxml tree
+                return self._parse_with_pdfminer(file_path, result)
             result["error"] = "pdfquery library not available. Install with: pip install pdfquery"
             return result
         
@@ -47,7 +52,10 @@ class PDFQueryParser:
             pdf.load()
             
             result["metadata"]["method"] = "pdfquery"
-            result["metadata"]["total_pages"] = len(pdf.pq('LTPage'))
+            all_pages = pdf.pq('LTPage')
+            result["metadata"]["total_pages"] = len(all_pages)
+            # Page element -> page number, looked up once per text line
+            page_numbers = {page: idx + 1 for idx, page in enumerate(all_pages)}
             
             # Extract all text elements
             text_elements = pdf.pq('LTTextLineHorizontal')
@@ -62,14 +70,7 @@ class PDFQueryParser:
                 while page_elem is not None and page_elem.tag != 'LTPage':
                     page_elem = page_elem.getparent()
                 
-                page_num = 1
-                if page_elem is not None:
-                    # Find page number
-                    all_pages = pdf.pq('LTPage')
-                    for idx, page in enumerate(all_pages):
-                        if page == page_elem:
-                            page_num = idx + 1
-                            break
+                page_num = page_numbers.get(page_elem, 1)
                 
                 # Extract text
                 text_content = text_elem.text.strip()
@@ -108,4 +109,34 @@ class PDFQueryParser:
             result["error"] = f"Failed to parse PDF with pdfquery: {str(e)}"
         
         return result
-
+    
+    def _parse_with_pdfminer(self, file_path: str, result: Dict) -> Dict:
+        """Fill result with the pdfquery-style page/element layout from PDFMinerParser"""
+        try:
+            pages = PDFMinerParser().extract_elements(file_path)
+            result["metadata"]["method"] = "pdfminer.six"
+            result["metadata"]["total_pages"] = len(pages)
+            
+            full_text = []
+            total_elements = 0
+            for i, elements in enumerate(pages):
+                total_elements += len(elements)
+                if not elements:
+                    continue
+                page_texts = [element["text"] for element in elements]
+                result["pages"].append({
+                    "page_number": i + 1,
+                    "text": "".join(text + "\n" for text in page_texts),
+                    "elements": elements
+                })
+                full_text.extend(page_texts)
+            
+            result["text"] = "\n".join(full_text)
+            result["metadata"]["total_elements"] = total_elements
+            result["metadata"]["has_text"] = len(full_text) > 0
+            result["metadata"]["extraction_method"] = "pdfminer text lines"
+        
+        except Exception as e:
+            result["error"] = f"Failed to parse PDF with pdfminer: {str(e)}"
+        
+        return result
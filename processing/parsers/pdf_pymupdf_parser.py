@@ -1,7 +1,8 @@
 """
 PDF document parser using PyMuPDF (fitz) - Fast and accurate
 """
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 try:
     import fitz  # PyMuPDF
@@ -9,19 +10,67 @@ try:
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
+from processing.parsers.process_pool import map_in_process
+
+# Documents shorter than this are parsed in-thread (process hand-off would cost more)
+PARALLEL_MIN_PAGES = 8
+# Page ranges parsed concurrently in worker processes
+PAGE_RANGE_WORKERS = min(os.cpu_count() or 1, 4)
+
+
+def _extract_pages(doc, start: int, end: int, extract_annotations: bool = True) -> List[Tuple[Dict, int]]:
+    """(page data, text block count) for pages start..end-1, in one pass per page"""
+    pages = []
+    for i in range(start, end):
+        page = doc[i]
+        # Extract text
+        page_text = page.get_text()
+        
+        # Extract images info
+        image_list = page.get_images()
+        
+        # Extract annotations (most pages have none; first_annot probes that without walking them)
+        annotations = []
+        if extract_annotations and page.first_annot is not None:
+            for annot in page.annots():
+                annotations.append({
+                    "type": annot.type[1],
+                    "content": annot.info.get("content", "")
+                })
+        
+        page_data = {
+            "page_number": i + 1,
+            "text": page_text,
+            "images_count": len(image_list),
+            "annotations": annotations
+        }
+        # Text blocks with formatting info (only their count is reported)
+        pages.append((page_data, len(page.get_text("blocks"))))
+    return pages
+
+
+def _parse_page_range(file_path: str, start: int, end: int,
+                      extract_annotations: bool = True) -> List[Tuple[Dict, int]]:
+    """Worker-process entry point: open the document and extract one page range"""
+    with fitz.open(file_path) as doc:
+        return _extract_pages(doc, start, end, extract_annotations)
+
 
 class PyMuPDFParser:
     """Parse PDF documents using PyMuPDF (fitz)"""
     
-    def __init__(self):
+    def __init__(self, extract_annotations: bool = True):
         self.name = "pymupdf_parser"
+        # False skips reading annotations (pages then report an empty list)
+        self.extract_annotations = extract_annotations
     
-    def parse(self, file_path: str) -> Dict:
+    def parse(self, file_path: str, data: Optional[bytes] = None) -> Dict:
         """
         Parse PDF file using PyMuPDF
         
         Args:
             file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
             
         Returns:
             Dictionary with extracted content
@@ -39,50 +88,34 @@ class PyMuPDFParser:
             return result
         
         try:
-            doc = fitz.open(file_path)
+            doc = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(file_path)
             
             result["metadata"]["total_pages"] = len(doc)
             result["metadata"]["method"] = "PyMuPDF"
             
-            # Extract document metadata
-            if doc.metadata:
+            # Extract document metadata (doc.metadata builds a new dict on every access)
+            document_info = doc.metadata
+            if document_info:
                 result["metadata"]["document_info"] = {
-                    k: str(v) for k, v in doc.metadata.items()
+                    k: v if type(v) is str else str(v) for k, v in document_info.items()
                 }
             
-            full_text = []
-            for i, page in enumerate(doc):
-                # Extract text
-                page_text = page.get_text()
-                full_text.append(page_text)
-                
-                # Extract images info
-                image_list = page.get_images()
-                
-                # Extract annotations
-                annotations = []
-                for annot in page.annots():
-                    annotations.append({
-                        "type": annot.type[1],
-                        "content": annot.info.get("content", "")
-                    })
-                
-                page_data = {
-                    "page_number": i + 1,
-                    "text": page_text,
-                    "images_count": len(image_list),
-                    "annotations": annotations
-                }
-                result["pages"].append(page_data)
-            
-            result["text"] = "\n\n".join(full_text)
-            
-            # Extract text blocks with formatting info
-            blocks = []
-            for page in doc:
-                blocks.extend(page.get_text("blocks"))
+            page_count = len(doc)
+            pages = None
+            if page_count >= PARALLEL_MIN_PAGES and PAGE_RANGE_WORKERS > 1 and os.path.isfile(file_path):
+                # Split the pages into one contiguous range per worker; workers read the file themselves
+                step = -(-page_count // PAGE_RANGE_WORKERS)
+                ranges = [(file_path, start, min(start + step, page_count), self.extract_annotations)
+                          for start in range(0, page_count, step)]
+                range_results = map_in_process(_parse_page_range, ranges)
+                if range_results is not None:
+                    pages = [page for range_pages in range_results for page in range_pages]
+            if pages is None:
+                pages = _extract_pages(doc, 0, page_count, self.extract_annotations)
             
-            result["metadata"]["text_blocks_count"] = len(blocks)
+            result["pages"] = [page_data for page_data, _ in pages]
+            result["text"] = "\n\n".join(page_data["text"] for page_data in result["pages"])
+            result["metadata"]["text_blocks_count"] = sum(block_count for _, block_count in pages)
             
             doc.close()
         
@@ -1,7 +1,9 @@
 """
 PDF document parser using pypdf (successor to PyPDF2) - Modern and actively maintained
 """
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional
+from io import BytesIO
 from pathlib import Path
 try:
     from pypdf import PdfReader
@@ -14,6 +16,19 @@ except ImportError:
     except ImportError:
         PYPDF_AVAILABLE = False
 
+from processing.parsers.process_pool import map_in_process
+
+# Documents shorter than this are extracted in-thread (process hand-off would cost more)
+PARALLEL_MIN_PAGES = 8
+# Page ranges extracted concurrently in worker processes
+PAGE_RANGE_WORKERS = min(os.cpu_count() or 1, 8)
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Worker-process entry point: text of pages start..end-1 from a reader of its own"""
+    pages = PdfReader(file_path).pages
+    return [pages[i].extract_text() or "" for i in range(start, end)]
+
 
 class PyPDFParser:
     """Parse PDF documents using pypdf (modern PyPDF2 successor)"""
@@ -21,12 +36,13 @@ class PyPDFParser:
     def __init__(self):
         self.name = "pypdf_parser"
     
-    def parse(self, file_path: str) -> Dict:
+    def parse(self, file_path: str, data: Optional[bytes] = None) -> Dict:
         """
         Parse PDF file using pypdf
         
         Args:
             file_path: Path to PDF file
+            data: PDF bytes already in memory (read instead of file_path if given)
             
         Returns:
             Dictionary with extracted content
@@ -44,22 +60,33 @@ class PyPDFParser:
             return result
         
         try:
-            pdf_reader = PdfReader(file_path)
+            pdf_reader = PdfReader(BytesIO(data) if data is not None else file_path)
             
-            result["metadata"]["total_pages"] = len(pdf_reader.pages)
+            page_count = len(pdf_reader.pages)
+            result["metadata"]["total_pages"] = page_count
             result["metadata"]["method"] = "pypdf"
             
-            # Extract document metadata
-            if pdf_reader.metadata:
+            # Extract document metadata (pdf_reader.metadata rebuilds the info dict on every access)
+            document_info = pdf_reader.metadata
+            if document_info:
+                # Plain str values are kept as is; pypdf's string objects become plain str
                 result["metadata"]["document_info"] = {
-                    k: str(v) for k, v in pdf_reader.metadata.items()
+                    k: v if type(v) is str else str(v) for k, v in document_info.items()
                 }
             
-            full_text = []
-            for i, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text() or ""
-                full_text.append(page_text)
-                
+            # pypdf's extraction is pure Python (threads would just take turns on the GIL) and
+            # a reader is not safe to share, so long documents go to worker processes by page range
+            full_text = None
+            if page_count >= PARALLEL_MIN_PAGES and PAGE_RANGE_WORKERS > 1 and os.path.isfile(file_path):
+                step = -(-page_count // PAGE_RANGE_WORKERS)
+                ranges = [(file_path, start, min(start + step, page_count)) for start in range(0, page_count, step)]
+                range_texts = map_in_process(_extract_page_range, ranges)
+                if range_texts is not None:
+                    full_text = [page_text for texts in range_texts for page_text in texts]
+            if full_text is None:
+                full_text = [page.extract_text() or "" for page in pdf_reader.pages]
+            
+            for i, page_text in enumerate(full_text):
                 page_data = {
                     "page_number": i + 1,
                     "text": page_text,
@@ -70,8 +97,8 @@ class PyPDFParser:
             result["text"] = "\n\n".join(full_text)
             
             # Extract form fields if any
-            if pdf_reader.metadata:
-                result["metadata"]["has_forms"] = len(pdf_reader.pages) > 0
+            if document_info:
+                result["metadata"]["has_forms"] = page_count > 0
             
         except Exception as e:
             result["error"] = f"Failed to parse PDF with pypdf: {str(e)}"
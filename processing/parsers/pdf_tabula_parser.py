@@ -1,7 +1,7 @@
 """
 PDF document parser using Tabula - Good for table extraction
 """
-from typing import Dict, List
+from typing import Dict, Iterator, List
 from pathlib import Path
 try:
     import tabula
@@ -9,12 +9,43 @@ try:
 except ImportError:
     TABULA_AVAILABLE = False
 
+# Pages handed to one tabula.read_pdf call (bounds the JVM heap and the DataFrames held at once)
+PAGE_BATCH_SIZE = 50
+
+
+def _page_count(file_path: str) -> int:
+    """Number of pages in the PDF (0 if it can't be read here)"""
+    try:
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+    except Exception:
+        return 0
+
 
 class TabulaParser:
     """Parse PDF documents using Tabula (table extraction)"""
     
-    def __init__(self):
+    def __init__(self, page_batch_size: int = PAGE_BATCH_SIZE):
         self.name = "tabula_parser"
+        self.page_batch_size = page_batch_size
+    
+    def iter_tables(self, file_path: str) -> Iterator:
+        """
+        Yield the document's tables as DataFrames, reading page_batch_size pages per Tabula call
+        
+        Args:
+            file_path: Path to PDF file
+            
+        Returns:
+            Iterator over DataFrames, in document order
+        """
+        total_pages = _page_count(file_path)
+        if total_pages <= self.page_batch_size:
+            yield from tabula.read_pdf(file_path, pages='all', multiple_tables=True)
+            return
+        for start in range(1, total_pages + 1, self.page_batch_size):
+            end = min(start + self.page_batch_size - 1, total_pages)
+            yield from tabula.read_pdf(file_path, pages=f"{start}-{end}", multiple_tables=True)
     
     def parse(self, file_path: str) -> Dict:
         """
@@ -42,14 +73,12 @@ class TabulaParser:
         try:
             import pandas as pd
             
-            # Extract tables from all pages
-            dfs = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
-            
+            # Extract tables from all pages, one page batch at a time; each DataFrame is
+            # converted and released before the next batch is read
             result["metadata"]["method"] = "tabula"
-            result["metadata"]["total_tables"] = len(dfs)
             
             all_text = []
-            for i, df in enumerate(dfs):
+            for i, df in enumerate(self.iter_tables(file_path)):
                 # Convert DataFrame to list of lists
                 table_data = df.fillna("").values.tolist()
                 table_text = "\n".join([" | ".join([str(cell) for cell in row]) for row in table_data])
@@ -64,12 +93,14 @@ class TabulaParser:
                 all_text.append(table_text)
             
             result["text"] = "\n\n--- Table ---\n\n".join(all_text)
+            table_count = len(result["tables"])
+            result["metadata"]["total_tables"] = table_count
             
             # Create pages structure
-            if dfs:
+            if table_count:
                 # Estimate pages (tabula doesn't provide page info directly)
-                result["metadata"]["total_pages"] = len(dfs)  # Approximation
-                for i in range(len(dfs)):
+                result["metadata"]["total_pages"] = table_count  # Approximation
+                for i in range(table_count):
                     result["pages"].append({
                         "page_number": i + 1,
                         "text": all_text[i] if i < len(all_text) else "",
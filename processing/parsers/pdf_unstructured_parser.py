@@ -8,6 +8,7 @@ from pathlib import Path
 try:
     from unstructured.partition.pdf import partition_pdf
     from unstructured.chunking.title import chunk_by_title
+    from unstructured.documents.elements import Table, Title
     UNSTRUCTURED_AVAILABLE = True
 except ImportError:
     UNSTRUCTURED_AVAILABLE = False
@@ -54,74 +55,72 @@ class UnstructuredParser:
             result["metadata"]["method"] = "unstructured"
             result["metadata"]["total_elements"] = len(elements)
             
-            # Organize elements by type
-            text_elements = []
-            table_elements = []
-            title_elements = []
+            # One pass over the elements: each element's text, class name and metadata
+            # dict are computed once and shared by the categories, tables and pages
+            text_count = 0
+            table_count = 0
+            title_count = 0
+            full_text = []
+            tables = []
+            pages_dict = {}
             
             for element in elements:
-                element_dict = {
-                    "type": element.__class__.__name__,
-                    "text": str(element),
-                    "metadata": element.metadata.to_dict() if hasattr(element, 'metadata') else {}
-                }
+                element_text = str(element)
+                element_type = element.__class__.__name__
+                element_metadata = getattr(element, 'metadata', None)
+                metadata = element_metadata.to_dict() if element_metadata is not None else {}
                 
-                result["elements"].append(element_dict)
+                result["elements"].append({
+                    "type": element_type,
+                    "text": element_text,
+                    "metadata": metadata
+                })
+                full_text.append(element_text)
                 
                 # Categorize elements
-                if "Table" in element.__class__.__name__:
-                    table_elements.append(element_dict)
-                elif "Title" in element.__class__.__name__:
-                    title_elements.append(element_dict)
-                else:
-                    text_elements.append(element_dict)
-            
-            # Extract text from all elements
-            full_text = [str(elem) for elem in elements]
-            result["text"] = "\n\n".join(full_text)
-            
-            # Extract tables
-            tables = []
-            for elem in elements:
-                if "Table" in elem.__class__.__name__:
-                    if hasattr(elem, 'metadata') and hasattr(elem.metadata, 'text_as_html'):
+                if isinstance(element, Table):
+                    table_count += 1
+                    if element_metadata is not None:
                         # Convert HTML table to structured data
-                        table_data = {
-                            "html": elem.metadata.text_as_html,
-                            "text": str(elem)
-                        }
-                        tables.append(table_data)
-            
-            result["tables"] = tables
-            result["metadata"]["text_elements"] = len(text_elements)
-            result["metadata"]["table_elements"] = len(table_elements)
-            result["metadata"]["title_elements"] = len(title_elements)
-            
-            # Create pages structure (group elements by page if available)
-            pages_dict = {}
-            for i, element in enumerate(elements):
-                page_num = 1
-                if hasattr(element, 'metadata') and hasattr(element.metadata, 'page_number'):
-                    page_num = element.metadata.page_number
-                elif hasattr(element, 'metadata') and 'page_number' in element.metadata.to_dict():
-                    page_num = element.metadata.to_dict().get('page_number', 1)
+                        tables.append({
+                            "html": metadata.get("text_as_html"),
+                            "text": element_text
+                        })
+                elif isinstance(element, Title):
+                    title_count += 1
+                else:
+                    text_count += 1
                 
+                # Group elements by page (to_dict() leaves out unset fields)
+                page_num = metadata.get("page_number", 1)
                 if page_num not in pages_dict:
                     pages_dict[page_num] = {
                         "page_number": page_num,
-                        "text": "",
+                        "text_parts": [],
                         "elements": []
                     }
                 
-                pages_dict[page_num]["text"] += str(element) + "\n\n"
+                # Page text is joined once at the end instead of growing a string per element
+                pages_dict[page_num]["text_parts"].append(element_text)
                 pages_dict[page_num]["elements"].append({
-                    "type": element.__class__.__name__,
-                    "text": str(element)
+                    "type": element_type,
+                    "text": element_text
                 })
             
+            result["text"] = "\n\n".join(full_text)
+            result["tables"] = tables
+            result["metadata"]["text_elements"] = text_count
+            result["metadata"]["table_elements"] = table_count
+            result["metadata"]["title_elements"] = title_count
+            
             # Convert to pages list
             for page_num in sorted(pages_dict.keys()):
-                result["pages"].append(pages_dict[page_num])
+                page = pages_dict[page_num]
+                result["pages"].append({
+                    "page_number": page_num,
+                    "text": "".join(text + "\n\n" for text in page["text_parts"]),
+                    "elements": page["elements"]
+                })
             
             result["metadata"]["total_pages"] = len(pages_dict) if pages_dict else 1
         
@@ -0,0 +1,121 @@
+"""
+Process pool for parsers that spend most of their time in pure Python
+(threads give them no speedup because they hold the GIL)
+"""
+import os
+import atexit
+import pickle
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Heavy modules imported once per worker so the first parse doesn't pay for them
+PRELOAD_MODULES = ("pdfminer.high_level", "camelot", "fitz")
+# Workers for the whole app (several files may be parsed at once; don't spawn one per core each)
+MAX_POOL_WORKERS = min(os.cpu_count() or 1, 4)
+# The app is multithreaded, so never fork it directly: a forked child could inherit a held lock
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_mp_context = multiprocessing.get_context(_START_METHOD)
+if _START_METHOD == "forkserver":
+    # The default forkserver preload is ['__main__'], which under Streamlit is the app script:
+    # the server would import the whole app (every optional parser, session-state code) and
+    # fork each worker from that. Preload only the parser libraries the workers need.
+    _mp_context.set_forkserver_preload(list(PRELOAD_MODULES))
+
+_parser_pool: Optional[ProcessPoolExecutor] = None
+_parser_pool_lock = threading.Lock()
+
+
+def _preload_modules():
+    """Worker initializer: import the parser libraries that are installed"""
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+
+
+def _parse(parser_class, file_path: str) -> Dict:
+    return parser_class().parse(file_path)
+
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    """Create the shared parser process pool on first use"""
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            _parser_pool = ProcessPoolExecutor(
+                max_workers=MAX_POOL_WORKERS,
+                mp_context=_mp_context,
+                initializer=_preload_modules
+            )
+        return _parser_pool
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor):
+    """A worker died; drop the pool so the next call starts a fresh one"""
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is pool:
+            _parser_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_parser_pool():
+    global _parser_pool
+    with _parser_pool_lock:
+        pool, _parser_pool = _parser_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _picklable(*objects) -> bool:
+    """Whether the call can be sent to a worker (checked here; the pool pickles in a feeder thread)"""
+    try:
+        pickle.dumps(objects)
+        return True
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+
+
+def parse_in_process(parser_class, file_path: str) -> Optional[Dict]:
+    """
+    Run parser_class().parse(file_path) in a worker process
+    
+    Returns None if the pool could not run it (unpicklable parser or a dead worker);
+    exceptions raised by the parser itself propagate.
+    """
+    if not _picklable(parser_class, file_path):
+        return None
+    pool = _get_parser_pool()
+    try:
+        return pool.submit(_parse, parser_class, file_path).result()
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        return None
+
+
+def map_in_process(func: Callable, arg_tuples: Sequence[tuple]) -> Optional[List]:
+    """
+    Run func(*args) for every argument tuple in the worker processes, results in input order
+    
+    Returns None if the pool could not run them (unpicklable call or a dead worker).
+    An exception raised by func cancels the remaining calls and propagates.
+    """
+    if not _picklable(func, arg_tuples):
+        return None
+    pool = _get_parser_pool()
+    futures = []
+    try:
+        futures = [pool.submit(func, *args) for args in arg_tuples]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
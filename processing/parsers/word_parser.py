@@ -1,6 +1,7 @@
 """
 Word document parser
 """
+from operator import attrgetter
 from typing import Dict
 from pathlib import Path
 try:
@@ -13,8 +14,10 @@ except ImportError:
 class WordParser:
     """Parse Word documents"""
     
-    def __init__(self):
+    def __init__(self, extract_tables: bool = True):
         self.name = "word_parser"
+        # False skips reading table cells (tables are still counted)
+        self.extract_tables = extract_tables
     
     def parse(self, file_path: str) -> Dict:
         """
@@ -44,36 +47,47 @@ class WordParser:
             
             # Extract paragraphs
             paragraphs = []
+            # Style id -> style name. Resolving para.style searches the style part on every
+            # access, so each distinct style is resolved once per document
+            style_names = {}
             for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text)
+                para_text = para.text
+                if para_text.strip():
+                    paragraphs.append(para_text)
+                    style_id = para._p.style
+                    if style_id not in style_names:
+                        style = para.style
+                        style_names[style_id] = style.name if style else None
                     result["paragraphs"].append({
-                        "text": para.text,
-                        "style": para.style.name if para.style else None
+                        "text": para_text,
+                        "style": style_names[style_id]
                     })
             
             # Extract tables
-            for i, table in enumerate(doc.tables):
-                table_data = {
-                    "table_number": i + 1,
-                    "rows": []
-                }
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data["rows"].append(row_data)
-                result["tables"].append(table_data)
+            tables = doc.tables
+            if self.extract_tables:
+                get_text = attrgetter("text")
+                for i, table in enumerate(tables):
+                    table_data = {
+                        "table_number": i + 1,
+                        "rows": [list(map(get_text, row.cells)) for row in table.rows]
+                    }
+                    result["tables"].append(table_data)
             
             result["text"] = "\n\n".join(paragraphs)
             result["metadata"]["total_paragraphs"] = len(paragraphs)
-            result["metadata"]["total_tables"] = len(doc.tables)
+            result["metadata"]["total_tables"] = len(tables)
             
             # Extract core properties if available
-            if doc.core_properties:
+            core_properties = doc.core_properties
+            if core_properties:
+                created = core_properties.created
+                modified = core_properties.modified
                 result["metadata"]["document_properties"] = {
-                    "title": doc.core_properties.title,
-                    "author": doc.core_properties.author,
-                    "created": str(doc.core_properties.created) if doc.core_properties.created else None,
-                    "modified": str(doc.core_properties.modified) if doc.core_properties.modified else None
+                    "title": core_properties.title,
+                    "author": core_properties.author,
+                    "created": str(created) if created else None,
+                    "modified": str(modified) if modified else None
                 }
         
         except Exception as e:
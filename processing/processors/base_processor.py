@@ -1,31 +1,55 @@
 """
 Base processor class
 """
+import os
+import time
+import importlib
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pathlib import Path
 
-from processing.parsers.pdf_parser import PDFParser
-from processing.parsers.word_parser import WordParser
-from processing.parsers.excel_parser import ExcelParser
-from processing.parsers.ppt_parser import PPTParser
+import orjson
+
+from utils.file_utils import TMP_SUFFIX, ensure_directory, forget_directory, get_bytes_hash, write_atomic
+
+# file type -> (module, class) of its parser; imported and built on first use so a
+# processor only loads the parsing libraries for file types it actually sees
+PARSER_CLASSES = {
+    'pdf': ('processing.parsers.pdf_parser', 'PDFParser'),
+    'word': ('processing.parsers.word_parser', 'WordParser'),
+    'excel': ('processing.parsers.excel_parser', 'ExcelParser'),
+    'powerpoint': ('processing.parsers.ppt_parser', 'PPTParser'),
+}
+# File types whose parser accepts the file's bytes (parse(file_path, data=...))
+STREAM_FILE_TYPES = frozenset({'pdf'})
+# Parse cache bounds: entries unused this long are dropped, then the least recently used
+# ones until the directory fits the size limit (checked at most once per interval)
+PARSE_CACHE_MAX_AGE = 7 * 24 * 3600
+PARSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+PARSE_CACHE_EVICT_INTERVAL = 60
 
 
 class BaseProcessor(ABC):
     """Base class for all processors"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, cache_dir: Optional[Path] = None):
         self.name = name
-        self.parsers = {
-            'pdf': PDFParser(),
-            'word': WordParser(),
-            'excel': ExcelParser(),
-            'powerpoint': PPTParser()
-        }
+        # Parse results are memoized here by file content hash (disabled if None)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.parsers = {}
+        self._last_evicted = float("-inf")
+        self._evict_lock = threading.Lock()
     
     def get_parser(self, file_type: str):
-        """Get appropriate parser for file type"""
-        return self.parsers.get(file_type)
+        """Get appropriate parser for file type (created on first request)"""
+        parser = self.parsers.get(file_type)
+        if parser is None and file_type in PARSER_CLASSES:
+            module_name, class_name = PARSER_CLASSES[file_type]
+            parser_class = getattr(importlib.import_module(module_name), class_name)
+            # Concurrent first calls may both build one; every caller gets the stored instance
+            parser = self.parsers.setdefault(file_type, parser_class())
+        return parser
     
     @abstractmethod
     def process(self, file_path: str, file_type: str, **kwargs) -> Dict:
@@ -42,16 +66,113 @@ class BaseProcessor(ABC):
         """
         pass
     
-    def parse_document(self, file_path: str, file_type: str) -> Dict:
-        """Parse document using appropriate parser"""
+    def parse_document(self, file_path: str, file_type: str, force_refresh: bool = False) -> Dict:
+        """Parse document using appropriate parser (cached by content hash when cache_dir is set)"""
         parser = self.get_parser(file_type)
         if parser:
-            return parser.parse(file_path)
+            # The file is read once: the same bytes are hashed for the cache and parsed
+            data = None
+            if file_type in STREAM_FILE_TYPES or self.cache_dir is not None:
+                try:
+                    data = Path(file_path).read_bytes()
+                except OSError:
+                    # Unreadable file: let the parser report it
+                    pass
+            
+            cache_path = None
+            if self.cache_dir is not None and data is not None:
+                cache_path = self._parse_cache_path(data, file_type, parser.name)
+                if not force_refresh:
+                    cached = self._read_parse_cache(cache_path)
+                    if cached is not None:
+                        # Entries are stored without a path; report the file parsed now
+                        cached["file_path"] = file_path
+                        return cached
+            
+            if data is not None and file_type in STREAM_FILE_TYPES:
+                result = parser.parse(file_path, data=data)
+            else:
+                result = parser.parse(file_path)
+            if cache_path is not None and "error" not in result:
+                self._write_parse_cache(cache_path, result)
+            return result
         else:
             return {
                 "error": f"No parser available for file type: {file_type}",
                 "file_path": file_path,
                 "file_type": file_type
             }
-
-
+    
+    def _parse_cache_path(self, data: bytes, file_type: str, parser_name: str) -> Path:
+        """Cache file for a parse result: <content hash>_<file type>_<parser name>.json"""
+        file_hash = get_bytes_hash(data).replace(":", "_")
+        return self.cache_dir / f"{file_hash}_{file_type}_{parser_name}.json"
+    
+    def _read_parse_cache(self, cache_path: Path) -> Optional[Dict]:
+        """Cached parse result, or None; a hit counts as a use for eviction"""
+        try:
+            with open(cache_path, "rb") as f:
+                result = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return result
+    
+    def _write_parse_cache(self, cache_path: Path, result: Dict) -> None:
+        """Store a parse result; a result that can't be serialized is simply not cached"""
+        # file_path belongs to the upload that was parsed first, not to the content
+        stored = {key: value for key, value in result.items() if key != "file_path"}
+        try:
+            data = orjson.dumps(stored, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            return
+        try:
+            ensure_directory(self.cache_dir)
+            write_atomic(cache_path, data)
+        except OSError:
+            # The directory may have been removed since it was created
+            forget_directory(self.cache_dir)
+            return
+        self._evict_parse_cache()
+    
+    def _evict_parse_cache(self) -> None:
+        """Remove stale entries and keep the parse cache under PARSE_CACHE_MAX_BYTES"""
+        now = time.monotonic()
+        with self._evict_lock:
+            if now - self._last_evicted < PARSE_CACHE_EVICT_INTERVAL:
+                return
+            self._last_evicted = now
+        
+        expired_before = time.time() - PARSE_CACHE_MAX_AGE
+        entries = []  # (last used, size, path) of the entries that are kept
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_mtime < expired_before:
+                            os.unlink(entry.path)
+                        elif not entry.name.endswith(TMP_SUFFIX):
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    except OSError:
+                        pass
+        except OSError:
+            return
+        
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= PARSE_CACHE_MAX_BYTES:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= PARSE_CACHE_MAX_BYTES:
+                break
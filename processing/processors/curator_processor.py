@@ -1,18 +1,27 @@
 """
 Curator processor using NeMo Curator-inspired text curation
 """
-from typing import Dict, Optional
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
 from processing.processors.base_processor import BaseProcessor
 from processing.curation.text_curator import TextCurator
 
+# Parsed documents allowed to wait for curation in process_batch
+PIPELINE_QUEUE_SIZE = 16
+# Marks the end of the parse stage's output
+_PIPELINE_DONE = object()
+
 
 class CuratorProcessor(BaseProcessor):
     """Text curation processor inspired by NVIDIA NeMo Curator"""
     
     def __init__(self, enable_cleaning: bool = True, 
                  enable_quality_check: bool = True,
-                 enable_language_detection: bool = True):
-        super().__init__("curator_processor")
+                 enable_language_detection: bool = True,
+                 cache_dir: Optional[Path] = None):
+        super().__init__("curator_processor", cache_dir)
         self.curator = TextCurator()
         self.enable_cleaning = enable_cleaning
         self.enable_quality_check = enable_quality_check
@@ -30,11 +39,61 @@ class CuratorProcessor(BaseProcessor):
         Returns:
             Curated processed result
         """
+        return self._curate(*self._parse_for_curation(file_path, file_type))
+    
+    def process_batch(self, files: Iterable[Tuple[str, str]]) -> List[Dict]:
+        """
+        Process several files, parsing the next file while the previous one is curated
+        
+        Args:
+            files: (file_path, file_type) pairs
+            
+        Returns:
+            One process() result per file, in input order
+        """
+        parsed = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def parse_stage():
+            try:
+                for file_path, file_type in files:
+                    if stop.is_set():
+                        break
+                    try:
+                        parsed.put(self._parse_for_curation(file_path, file_type))
+                    except Exception as e:
+                        parsed.put(({"error": f"Failed to parse document: {str(e)}", "file_path": file_path}, ""))
+            finally:
+                parsed.put(_PIPELINE_DONE)
+        
+        parser_thread = threading.Thread(target=parse_stage, daemon=True)
+        parser_thread.start()
+        
+        results = []
+        try:
+            while True:
+                item = parsed.get()
+                if item is _PIPELINE_DONE:
+                    break
+                results.append(self._curate(*item))
+        finally:
+            # If curation failed, stop parsing and unblock the parse stage so the thread ends
+            stop.set()
+            while parser_thread.is_alive():
+                try:
+                    parsed.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            parser_thread.join()
+        return results
+    
+    def _parse_for_curation(self, file_path: str, file_type: str) -> Tuple[Dict, str]:
+        """Parse the document and pick the text to curate (parse stage)"""
         # First parse the document
         parsed_result = self.parse_document(file_path, file_type)
         
         if "error" in parsed_result:
-            return parsed_result
+            return parsed_result, ""
         
         # Set processor name
         parsed_result["processor"] = self.name
@@ -42,13 +101,20 @@ class CuratorProcessor(BaseProcessor):
             parsed_result["original_parser"] = parsed_result["parser"]
         
         # Extract text for curation
-        text_to_curate = parsed_result.get("text", "")
+        text_to_curate = parsed_result.get("text") or ""
         
         # If no direct text, try to extract from pages
-        if not text_to_curate and parsed_result.get("pages"):
-            text_to_curate = "\n".join([
-                page.get("text", "") for page in parsed_result.get("pages", [])
-            ])
+        if not text_to_curate:
+            pages = parsed_result.get("pages")
+            if pages:
+                text_to_curate = "\n".join([page.get("text", "") for page in pages])
+        
+        return parsed_result, text_to_curate
+    
+    def _curate(self, parsed_result: Dict, text_to_curate: str) -> Dict:
+        """Curate the extracted text into the parsed result (curation stage)"""
+        if "error" in parsed_result:
+            return parsed_result
         
         # Curate text
         if text_to_curate:
@@ -59,18 +125,22 @@ class CuratorProcessor(BaseProcessor):
                 enable_language_detection=self.enable_language_detection
             )
             
+            curation_metadata = curation_result["curation_metadata"]
+            quality = curation_metadata.get("quality") or {}
+            language = curation_metadata.get("language") or {}
+            
             # Update text with curated version
             parsed_result["text"] = curation_result["curated_text"]
             parsed_result["original_text"] = curation_result["original_text"]
-            parsed_result["curation_metadata"] = curation_result["curation_metadata"]
+            parsed_result["curation_metadata"] = curation_metadata
             
             # Add curation statistics
             parsed_result["curation_stats"] = {
                 "text_cleaned": self.enable_cleaning,
                 "quality_assessed": self.enable_quality_check,
                 "language_detected": self.enable_language_detection,
-                "quality_score": curation_result["curation_metadata"].get("quality", {}).get("quality_score", 0),
-                "detected_language": curation_result["curation_metadata"].get("language", {}).get("language", "unknown")
+                "quality_score": quality.get("quality_score", 0),
+                "detected_language": language.get("language", "unknown")
             }
         
         return parsed_result
@@ -2,6 +2,7 @@
 Document AI processor using various AI models
 """
 from typing import Dict, Optional
+from pathlib import Path
 import json
 from processing.processors.base_processor import BaseProcessor
 
@@ -9,8 +10,8 @@ from processing.processors.base_processor import BaseProcessor
 class DocumentAIProcessor(BaseProcessor):
     """AI-powered document processor"""
     
-    def __init__(self, model_name: Optional[str] = None):
-        super().__init__("document_ai")
+    def __init__(self, model_name: Optional[str] = None, cache_dir: Optional[Path] = None):
+        super().__init__("document_ai", cache_dir)
         self.model_name = model_name
     
     def process(self, file_path: str, file_type: str, **kwargs) -> Dict:
@@ -31,6 +32,19 @@ class DocumentAIProcessor(BaseProcessor):
         if "error" in parsed_result:
             return parsed_result
         
+        return self.enhance(parsed_result, **kwargs)
+    
+    def enhance(self, parsed_result: Dict, **kwargs) -> Dict:
+        """
+        Apply the AI enhancements to an already parsed document
+        
+        Args:
+            parsed_result: Parser output (top-level keys are updated in place)
+            **kwargs: Additional options (e.g., ai_model, enhancement_type)
+            
+        Returns:
+            Enhanced processed result
+        """
         # 프로세서 이름 명시적으로 설정 (parser와 구분)
         parsed_result["processor"] = self.name
         # 원본 parser 정보는 유지하되, processor로 구분
@@ -47,21 +61,25 @@ class DocumentAIProcessor(BaseProcessor):
         # Basic AI enhancements (can be extended with actual AI calls)
         if parsed_result.get("text"):
             text = parsed_result["text"]
+            # Tokenized once; reused for the statistics and whitespace normalization
+            words = text.split()
+            
+            # 텍스트 정제 및 향상 (간단한 전처리)
+            # 공백 정규화
+            normalized_text = " ".join(words)
+            # 문장 단위로 정리 (공백 정규화는 '.' 위치와 빈 문장 여부를 바꾸지 않으므로
+            # 원문 대신 정규화된 텍스트를 한 번만 나눠 문장 수 통계에도 사용)
+            sentences = [s for s in (piece.strip() for piece in normalized_text.split('.')) if s]
             
             # Add basic statistics
             parsed_result["statistics"] = {
                 "total_characters": len(text),
-                "total_words": len(text.split()),
-                "total_sentences": len([s for s in text.split('.') if s.strip()]),
-                "estimated_reading_time_minutes": len(text.split()) / 200  # Average reading speed
+                "total_words": len(words),
+                "total_sentences": len(sentences),
+                "estimated_reading_time_minutes": len(words) / 200  # Average reading speed
             }
-        
-        # 텍스트 정제 및 향상 (간단한 전처리)
-        if parsed_result.get("text"):
-            # 공백 정규화
-            parsed_result["text"] = " ".join(parsed_result["text"].split())
-            # 문장 단위로 정리
-            sentences = [s.strip() for s in parsed_result["text"].split('.') if s.strip()]
+            
+            parsed_result["text"] = normalized_text
             parsed_result["cleaned_text"] = ". ".join(sentences) + ("." if sentences else "")
         
         return parsed_result
@@ -2,6 +2,7 @@
 Ensemble processor that combines multiple processors
 """
 from typing import Dict, List, Optional
+from pathlib import Path
 from processing.processors.base_processor import BaseProcessor
 from processing.processors.document_ai import DocumentAIProcessor
 from processing.comparison import ResultComparator
@@ -10,10 +11,12 @@ from processing.comparison import ResultComparator
 class EnsembleProcessor(BaseProcessor):
     """Combine results from multiple processors"""
     
-    def __init__(self, processors: Optional[List[str]] = None):
-        super().__init__("ensemble_processor")
+    def __init__(self, processors: Optional[List[str]] = None, cache_dir: Optional[Path] = None):
+        super().__init__("ensemble_processor", cache_dir)
         self.processors = processors or ["pdf_parser", "document_ai"]
         self.comparator = ResultComparator()
+        # Built once and reused by every process() call
+        self.ai_processor = DocumentAIProcessor(cache_dir=cache_dir) if "document_ai" in self.processors else None
     
     def process(self, file_path: str, file_type: str, **kwargs) -> Dict:
         """
@@ -34,10 +37,11 @@ class EnsembleProcessor(BaseProcessor):
         if "error" not in base_result:
             results.append(base_result)
         
-        # Process with AI processor if enabled
-        if "document_ai" in self.processors:
-            ai_processor = DocumentAIProcessor()
-            ai_result = ai_processor.process(file_path, file_type, **kwargs)
+        # Process with AI processor if enabled. It reuses the base parse instead of
+        # parsing the file again; enhance() only replaces top-level keys, so a shallow
+        # copy keeps base_result intact
+        if self.ai_processor is not None and "error" not in base_result:
+            ai_result = self.ai_processor.enhance(dict(base_result), **kwargs)
             if "error" not in ai_result:
                 results.append(ai_result)
         
@@ -70,35 +74,27 @@ class EnsembleProcessor(BaseProcessor):
             "all_pages": []
         }
         
-        # Combine text (deduplicate similar content)
+        # Combine text, metadata, tables and pages in one pass over the results
         texts = []
+        all_metadata = combined["combined_metadata"]
+        all_tables = combined["all_tables"]
+        all_pages = combined["all_pages"]
         for result in results:
             text = result.get("text", "")
             if text:
                 texts.append(text)
-        
-        combined["combined_text"] = "\n\n---\n\n".join(texts)
-        
-        # Combine metadata
-        all_metadata = {}
-        for result in results:
             if "metadata" in result:
                 all_metadata.update(result["metadata"])
-        combined["combined_metadata"] = all_metadata
-        
-        # Combine tables
-        for result in results:
             if "tables" in result:
-                combined["all_tables"].extend(result["tables"])
+                all_tables.extend(result["tables"])
             if "sheets" in result:
-                combined["all_tables"].extend(result["sheets"])
-        
-        # Combine pages
-        for result in results:
+                all_tables.extend(result["sheets"])
             if "pages" in result:
-                combined["all_pages"].extend(result["pages"])
+                all_pages.extend(result["pages"])
             if "slides" in result:
-                combined["all_pages"].extend(result["slides"])
+                all_pages.extend(result["slides"])
+        
+        combined["combined_text"] = "\n\n---\n\n".join(texts)
         
         return combined
 
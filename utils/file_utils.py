@@ -2,49 +2,190 @@
 File utility functions
 """
 import os
+import re
+import mmap
 import hashlib
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import AbstractSet, List, Optional, Sequence
 import mimetypes
+# Load the system MIME databases at import instead of on the first lookup
+mimetypes.init()
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+from config import ALLOWED_EXT_SET, EXT_TO_TYPE
+
+# File hashes identify files only (no signature checks), so use the fastest digest
+# (without blake3, SHA-256 runs on SHA-NI / ARMv8 crypto instructions and outpaces MD5)
+FILE_HASH_ALGORITHM = "blake3" if BLAKE3_AVAILABLE else "sha256"
+# hashlib.file_digest exists from Python 3.11; older versions read in large chunks
+_FILE_DIGEST = getattr(hashlib, "file_digest", None)
+HASH_CHUNK_SIZE = 1024 * 1024
+# Size range hashed through mmap (small files aren't worth mapping, huge ones would pin address space)
+MMAP_HASH_MIN_SIZE = 1024 * 1024
+MMAP_HASH_MAX_SIZE = 512 * 1024 * 1024
+_FADVISE_SEQUENTIAL = getattr(os, "POSIX_FADV_SEQUENTIAL", None) if hasattr(os, "posix_fadvise") else None
+_hash_buffers = threading.local()
+
+def _hash_buffer():
+    """Per-thread reusable read buffer (and its memoryview) for file hashing"""
+    buffers = getattr(_hash_buffers, "buffers", None)
+    if buffers is None:
+        buf = bytearray(HASH_CHUNK_SIZE)
+        buffers = _hash_buffers.buffers = (buf, memoryview(buf))
+    return buffers
+
+def new_file_hasher():
+    """Create the hash object used for file fingerprints"""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.sha256()
+
+def format_file_hash(hasher) -> str:
+    """Format a finished hasher as an algorithm-prefixed fingerprint"""
+    return f"{FILE_HASH_ALGORITHM}:{hasher.hexdigest()}"
 
 def get_file_hash(file_path: str) -> str:
-    """Generate MD5 hash for a file"""
-    hash_md5 = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    """Generate a fingerprint for a file (e.g. "blake3:<hex>"); unchanged files are only stat'ed"""
+    # Cached per (path, inode, size, mtime). A same-size rewrite within the filesystem's
+    # mtime resolution would return the old hash; call get_file_hash.cache_clear() after one
+    st = os.stat(file_path)
+    return _cached_file_hash(os.path.abspath(file_path), st.st_ino, st.st_size, st.st_mtime_ns)
+
+@functools.lru_cache(maxsize=8192)
+def _cached_file_hash(file_path: str, inode: int, size: int, mtime_ns: int) -> str:
+    return _hash_file(file_path)
+
+get_file_hash.cache_clear = _cached_file_hash.cache_clear
+
+def _hash_file(file_path: str) -> str:
+    if BLAKE3_AVAILABLE:
+        hasher = new_file_hasher()
+        hasher.update_mmap(file_path)
+        return format_file_hash(hasher)
+    # Unbuffered: reads go straight into the hash buffer without a second copy
+    with open(file_path, "rb", buffering=0) as f:
+        if MMAP_HASH_MIN_SIZE <= os.fstat(f.fileno()).st_size <= MMAP_HASH_MAX_SIZE:
+            # Medium files: hash straight from the mapped page cache (no read() copy)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher = new_file_hasher()
+                hasher.update(mapped)
+            return format_file_hash(hasher)
+        if _FADVISE_SEQUENTIAL is not None:
+            # Linux: ask for a larger readahead window (helps cold reads of large files)
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, _FADVISE_SEQUENTIAL)
+            except OSError:
+                pass
+        if _FILE_DIGEST is not None:
+            # Python 3.11+: the read/update loop runs in C
+            return format_file_hash(_FILE_DIGEST(f, FILE_HASH_ALGORITHM))
+        hasher = new_file_hasher()
+        buf, view = _hash_buffer()
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return format_file_hash(hasher)
+
+def get_bytes_hash(data) -> str:
+    """Generate a fingerprint for in-memory bytes (bytes or memoryview)"""
+    hasher = new_file_hasher()
+    hasher.update(data)
+    return format_file_hash(hasher)
+
+def _map_hashes(hash_func, items: Sequence) -> List[str]:
+    # hashlib and blake3 release the GIL while hashing (and reading), so threads hash different items in parallel
+    workers = min(len(items), os.cpu_count() or 1)
+    if workers <= 1:
+        return [hash_func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(hash_func, items))
+
+def get_file_hashes(file_paths: Sequence[str]) -> List[str]:
+    """Fingerprint several files at once, results in input order (use instead of get_file_hash in loops)"""
+    return _map_hashes(get_file_hash, file_paths)
+
+def get_bytes_hashes(buffers: Sequence) -> List[str]:
+    """Fingerprint several in-memory buffers at once, results in input order"""
+    return _map_hashes(get_bytes_hash, buffers)
+
+# Suffix of in-progress atomic writes (listings skip these)
+TMP_SUFFIX = ".tmp"
+WRITE_BUFFER_SIZE = 1024 * 1024  # 1MB
+
+@contextmanager
+def open_atomic(file_path: Path, mode: str):
+    """Open a temp file next to file_path and move it into place once writing succeeds"""
+    # Per-thread temp name so concurrent writers of the same file don't collide
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}-{threading.get_ident()}{TMP_SUFFIX}")
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        with open(tmp_path, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def write_atomic(file_path: Path, data) -> None:
+    """Write data to a temp file, then move it into place so readers never see partial output"""
+    with open_atomic(file_path, 'w' if isinstance(data, str) else 'wb') as f:
+        f.write(data)
 
 def get_file_type(file_path: str) -> Optional[str]:
     """Detect file type from extension"""
-    ext = Path(file_path).suffix.lower()
-    
-    type_mapping = {
-        '.pdf': 'pdf',
-        '.doc': 'word', '.docx': 'word',
-        '.xls': 'excel', '.xlsx': 'excel', '.xlsm': 'excel',
-        '.ppt': 'powerpoint', '.pptx': 'powerpoint',
-        '.txt': 'text', '.md': 'text',
-        '.png': 'image', '.jpg': 'image', '.jpeg': 'image',
-        '.gif': 'image', '.bmp': 'image'
-    }
-    
-    return type_mapping.get(ext)
-
-def is_allowed_file(filename: str, allowed_extensions: dict) -> bool:
+    # os.path.splitext is cheaper than building a Path (called per file row on every rerun)
+    return EXT_TO_TYPE.get(os.path.splitext(file_path)[1].lower())
+
+def is_allowed_file(filename: str, allowed_extensions: AbstractSet[str] = ALLOWED_EXT_SET) -> bool:
     """Check if file extension is allowed"""
-    ext = Path(filename).suffix.lower()
-    for file_type, extensions in allowed_extensions.items():
-        if ext in extensions:
-            return True
-    return False
+    return os.path.splitext(filename)[1].lower() in allowed_extensions
+
+# Anything other than letters/digits (incl. Korean), space, '-' and '_'
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]+")
+
+def sanitize_filename(name: str) -> str:
+    """Strip special characters from a file stem and replace spaces with '_'"""
+    return _UNSAFE_FILENAME_CHARS.sub("", name).strip().replace(' ', '_')
+
+@functools.lru_cache(maxsize=256)
+def _mime_type_for_extension(ext: str) -> str:
+    return mimetypes.guess_type("file" + ext)[0] or 'application/octet-stream'
 
 def get_mime_type(file_path: str) -> str:
     """Get MIME type of a file"""
-    return mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    ext = os.path.splitext(file_path)[1]
+    if ext.lower() in mimetypes.encodings_map:
+        # Compressed suffixes (".tar.gz") depend on the inner extension too
+        return mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    # The type only depends on the extension, so one lookup per extension
+    return _mime_type_for_extension(ext)
+
+# Directories already created/confirmed by ensure_directory in this process
+_known_directories = set()
+_known_directories_lock = threading.Lock()
 
 def ensure_directory(path: Path):
-    """Ensure directory exists"""
+    """Ensure directory exists (checked once per process; call forget_directory after removing it)"""
+    key = os.fspath(path)
+    if key in _known_directories:
+        return
     path.mkdir(parents=True, exist_ok=True)
+    with _known_directories_lock:
+        _known_directories.add(key)
+
+def forget_directory(path: Path):
+    """Drop a removed directory from ensure_directory's cache"""
+    with _known_directories_lock:
+        _known_directories.discard(os.fspath(path))
 
 